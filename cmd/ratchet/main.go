@@ -58,6 +58,9 @@ type config struct {
 	// Database configuration
 	Database storage.DatabaseConfig
 
+	// Background job configuration
+	Background background.Config
+
 	// Classifier configuration
 	Classifier classifier.Config
 
@@ -70,11 +73,17 @@ type config struct {
 	// Trace sampling rate
 	TraceSampleRate float64 `envconfig:"TRACE_SAMPLE_RATE" default:"0.01"`
 
+	// OTLP exporter endpoints, traces are only exported when one is set
+	OTLPEndpoint       string `envconfig:"OTEL_EXPORTER_OTLP_ENDPOINT"`
+	OTLPTracesEndpoint string `envconfig:"OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"`
+
 	// Slack configuration
 	Slack slack_integration.Config
 
 	// Documentation configuration path
 	Documentation string
+	// How often each documentation source is checked for changes
+	DocumentationRefreshInterval time.Duration `split_words:"true" default:"1h"`
 
 	// Commands configuration
 	Commands commands.Config
@@ -85,8 +94,8 @@ type config struct {
 	// Channel Monitor Configuration
 	ChannelMonitor channel_monitor.Config `split_words:"true"`
 
-	// Log level
-	LogLevel string `split_words:"true" default:"info"`
+	// Log level, defaults to debug in dev mode and info otherwise
+	LogLevel string `split_words:"true"`
 }
 
 var semverRe = regexp.MustCompile(`^v(\d+)\.(\d+)\.(\d+)`)
@@ -106,7 +115,7 @@ func main() {
 		return
 	}
 
-	ctx, cancel := context.WithCancel(context.Background())
+	ctx, cancel := signal.NotifyContext(context.Background(), os.Interrupt, syscall.SIGTERM)
 	defer cancel()
 
 	if err := godotenv.Load(); err != nil && !os.IsNotExist(err) {
@@ -119,6 +128,10 @@ func main() {
 		slog.ErrorContext(ctx, "error processing environment variables", "error", err)
 		os.Exit(1)
 	}
+	if c.DocumentationRefreshInterval <= 0 {
+		slog.ErrorContext(ctx, "documentation refresh interval must be positive", "interval", c.DocumentationRefreshInterval)
+		os.Exit(1)
+	}
 
 	// Logging setup
 	shortfile := func(groups []string, a slog.Attr) slog.Attr {
@@ -131,7 +144,12 @@ func main() {
 
 	var logLevel slog.Level
 	switch strings.ToLower(c.LogLevel) {
-	case "", "info":
+	case "":
+		logLevel = slog.LevelInfo
+		if c.DevMode {
+			logLevel = slog.LevelDebug
+		}
+	case "info":
 		logLevel = slog.LevelInfo
 	case "debug":
 		logLevel = slog.LevelDebug
@@ -152,7 +170,7 @@ func main() {
 	if c.DevMode {
 		logger = slog.New(tint.NewHandler(os.Stderr, &tint.Options{
 			AddSource:   true,
-			Level:       slog.LevelDebug,
+			Level:       logLevel,
 			TimeFormat:  time.Kitchen,
 			ReplaceAttr: shortfile,
 		}))
@@ -171,9 +189,7 @@ func main() {
 
 	// Tracing setup
 	var spanExporter sdkTrace.SpanExporter
-	otelEndpoint := os.Getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
-	tracesEndpoint := os.Getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
-	if otelEndpoint == "" && tracesEndpoint == "" {
+	if c.OTLPEndpoint == "" && c.OTLPTracesEndpoint == "" {
 		spanExporter = trace.NewNoOpSpanExporter()
 	} else {
 		spanExporter, err = otlptracehttp.New(ctx)
@@ -270,7 +286,7 @@ func main() {
 			os.Exit(1)
 		}
 	}
-	db, err := storage.New(ctx, c.Database.URL())
+	db, err := storage.New(ctx, c.Database)
 	if err != nil {
 		slog.ErrorContext(ctx, "setting up database", "error", err)
 		os.Exit(1)
@@ -306,12 +322,12 @@ func main() {
 
 		for _, source := range dc.Sources {
 			periodicJobs = append(periodicJobs, river.NewPeriodicJob(
-				river.PeriodicInterval(10*time.Minute),
+				background.JitteredInterval(c.DocumentationRefreshInterval, time.Minute),
 				func() (river.JobArgs, *river.InsertOpts) {
 					return background.DocumentationRefreshArgs{Source: source}, &river.InsertOpts{
 						UniqueOpts: river.UniqueOpts{
 							ByArgs:   true,
-							ByPeriod: time.Hour,
+							ByPeriod: c.DocumentationRefreshInterval,
 						},
 					}
 				},
@@ -368,7 +384,7 @@ func main() {
 	river.AddWorker(workers, modulesWorker)
 
 	// Start River client
-	riverClient, err := background.New(db, workers, periodicJobs)
+	riverClient, err := background.New(db, c.Background, workers, periodicJobs)
 	if err != nil {
 		slog.ErrorContext(ctx, "failed to create river client", "error", err)
 		os.Exit(1)
@@ -400,7 +416,9 @@ func main() {
 	wg, ctx := errgroup.WithContext(ctx)
 	wg.Go(func() error {
 		slog.InfoContext(ctx, "Starting river client")
-		return riverClient.Start(ctx)
+		// River hard-cancels running jobs when its start context is done, so
+		// detach it and stop the client gracefully on shutdown instead.
+		return riverClient.Start(context.WithoutCancel(ctx))
 	})
 	wg.Go(func() error {
 		slog.InfoContext(ctx, "Starting HTTP server", "addr", c.HTTPAddr)
@@ -419,21 +437,23 @@ func main() {
 		return slackIntegration.Run(ctx)
 	})
 	wg.Go(func() error {
-		c := make(chan os.Signal, 1)
-		signal.Notify(c, os.Interrupt, syscall.SIGINT, syscall.SIGTERM)
-
-		select {
-		case <-ctx.Done():
-		case <-c:
-			slog.InfoContext(ctx, "Shutting down")
-			cancel()
-
-			if err := server.Shutdown(ctx); err != nil {
-				return fmt.Errorf("shutting down http server: %w", err)
-			}
+		// Runs on a signal or when any other component fails, so that the
+		// remaining ones are always torn down and Wait returns.
+		<-ctx.Done()
+		slog.InfoContext(ctx, "Shutting down")
+
+		shutdownCtx, cancel := context.WithTimeout(context.WithoutCancel(ctx), 30*time.Second)
+		defer cancel()
+
+		var errs []error
+		if err := server.Shutdown(shutdownCtx); err != nil {
+			errs = append(errs, fmt.Errorf("shutting down http server: %w", err))
+		}
+		if err := riverClient.Stop(shutdownCtx); err != nil {
+			errs = append(errs, fmt.Errorf("stopping river client: %w", err))
 		}
 
-		return nil
+		return errors.Join(errs...)
 	})
 
 	if err := wg.Wait(); err != nil && !errors.Is(err, context.Canceled) {
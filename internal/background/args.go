@@ -1,6 +1,15 @@
 package background
 
-import "github.com/dynoinc/ratchet/internal/docs"
+import (
+	"github.com/riverqueue/river"
+
+	"github.com/dynoinc/ratchet/internal/docs"
+)
+
+// QueueBackfill holds jobs that page through Slack history. It gets its own
+// worker pool so that backfills run concurrently without starving the
+// default queue or tripping Slack rate limits.
+const QueueBackfill = "backfill"
 
 type ChannelOnboardWorkerArgs struct {
 	ChannelID string `json:"channel_id"`
@@ -11,6 +20,10 @@ func (c ChannelOnboardWorkerArgs) Kind() string {
 	return "channel_board"
 }
 
+func (c ChannelOnboardWorkerArgs) InsertOpts() river.InsertOpts {
+	return river.InsertOpts{Queue: QueueBackfill}
+}
+
 type BackfillThreadWorkerArgs struct {
 	ChannelID string `json:"channel_id"`
 	SlackTS   string `json:"slack_ts"`
@@ -20,6 +33,14 @@ func (b BackfillThreadWorkerArgs) Kind() string {
 	return "backfill_thread"
 }
 
+func (b BackfillThreadWorkerArgs) InsertOpts() river.InsertOpts {
+	return river.InsertOpts{
+		Queue: QueueBackfill,
+		// Re-onboarding a channel must not fetch the same thread twice.
+		UniqueOpts: river.UniqueOpts{ByArgs: true},
+	}
+}
+
 type ModulesWorkerArgs struct {
 	ChannelID  string `json:"channel_id"`
 	SlackTS    string `json:"slack_ts"`
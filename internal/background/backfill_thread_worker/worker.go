@@ -11,8 +11,6 @@ import (
 	"github.com/dynoinc/ratchet/internal"
 	"github.com/dynoinc/ratchet/internal/background"
 	"github.com/dynoinc/ratchet/internal/slack_integration"
-	"github.com/dynoinc/ratchet/internal/storage/schema"
-	"github.com/dynoinc/ratchet/internal/storage/schema/dto"
 )
 
 type BackfillThreadWorker struct {
@@ -40,28 +38,20 @@ func (w *BackfillThreadWorker) Work(ctx context.Context, job *river.Job[backgrou
 		return fmt.Errorf("getting conversation replies for channel ID %s: %w", job.Args.ChannelID, err)
 	}
 
-	addThreadMessageParams := make([]schema.AddThreadMessageParams, len(messages))
-	for i, message := range messages {
-		reactions := make(map[string]int)
-		for _, reaction := range message.Reactions {
-			reactions[reaction.Name] = reaction.Count
+	addThreadMessageParams := make([]internal.ThreadMessage, 0, len(messages))
+	for _, message := range messages {
+		// conversations.replies returns the parent as the first message; it
+		// is already stored by the channel backfill.
+		if message.Timestamp == job.Args.SlackTS {
+			continue
 		}
 
-		addThreadMessageParams[i] = schema.AddThreadMessageParams{
+		addThreadMessageParams = append(addThreadMessageParams, internal.ThreadMessage{
 			ChannelID: job.Args.ChannelID,
 			ParentTs:  job.Args.SlackTS,
 			Ts:        message.Timestamp,
-			Attrs: dto.MessageAttrs{
-				Message: dto.SlackMessage{
-					Text:        message.Text,
-					User:        message.User,
-					BotID:       message.BotID,
-					SubType:     message.SubType,
-					BotUsername: message.Username,
-				},
-				Reactions: reactions,
-			},
-		}
+			Attrs:     internal.MessageAttrs(message),
+		})
 	}
 
 	tx, err := w.bot.DB.Begin(ctx)
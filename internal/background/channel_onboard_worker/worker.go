@@ -8,6 +8,8 @@ import (
 	"github.com/jackc/pgx/v5"
 	"github.com/riverqueue/river"
 	"github.com/riverqueue/river/riverdriver/riverpgxv5"
+	"github.com/slack-go/slack"
+	"golang.org/x/sync/errgroup"
 
 	"github.com/dynoinc/ratchet/internal"
 	"github.com/dynoinc/ratchet/internal/background"
@@ -37,13 +39,8 @@ func (w *ChannelOnboardWorker) Timeout(job *river.Job[background.ChannelOnboardW
 }
 
 func (w *ChannelOnboardWorker) Work(ctx context.Context, job *river.Job[background.ChannelOnboardWorkerArgs]) error {
-	channelInfo, err := w.slackIntegration.GetConversationInfo(ctx, job.Args.ChannelID)
-	if err != nil {
-		return fmt.Errorf("getting channel info for channel ID %s: %w", job.Args.ChannelID, err)
-	}
-
 	lastNMsgs := job.Args.LastNMsgs
-	if lastNMsgs == 0 {
+	if lastNMsgs <= 0 {
 		if w.devMode {
 			lastNMsgs = 10
 		} else {
@@ -51,41 +48,38 @@ func (w *ChannelOnboardWorker) Work(ctx context.Context, job *river.Job[backgrou
 		}
 	}
 
-	messages, err := w.slackIntegration.GetConversationHistory(ctx, job.Args.ChannelID, lastNMsgs)
-	if err != nil {
-		return fmt.Errorf("getting conversation history for channel ID %s: %w", job.Args.ChannelID, err)
+	// The channel info and history calls are independent; overlap them.
+	var (
+		channelInfo *slack.Channel
+		messages    []slack.Message
+	)
+	g, gctx := errgroup.WithContext(ctx)
+	g.Go(func() error {
+		var err error
+		channelInfo, err = w.slackIntegration.GetConversationInfo(gctx, job.Args.ChannelID)
+		if err != nil {
+			return fmt.Errorf("getting channel info for channel ID %s: %w", job.Args.ChannelID, err)
+		}
+		return nil
+	})
+	g.Go(func() error {
+		var err error
+		messages, err = w.slackIntegration.GetConversationHistory(gctx, job.Args.ChannelID, lastNMsgs)
+		if err != nil {
+			return fmt.Errorf("getting conversation history for channel ID %s: %w", job.Args.ChannelID, err)
+		}
+		return nil
+	})
+	if err := g.Wait(); err != nil {
+		return err
 	}
 
-	addMessageParams := make([]schema.AddMessageParams, len(messages))
-	var backfillThreadInsertParams []river.InsertManyParams
+	addMessageParams := make([]internal.Message, len(messages))
 	for i, message := range messages {
-		reactions := make(map[string]int)
-		for _, reaction := range message.Reactions {
-			reactions[reaction.Name] = reaction.Count
-		}
-
-		addMessageParams[i] = schema.AddMessageParams{
+		addMessageParams[i] = internal.Message{
 			ChannelID: job.Args.ChannelID,
 			Ts:        message.Timestamp,
-			Attrs: dto.MessageAttrs{
-				Message: dto.SlackMessage{
-					SubType:     message.SubType,
-					Text:        message.Text,
-					User:        message.User,
-					BotID:       message.BotID,
-					BotUsername: message.Username,
-				},
-				Reactions: reactions,
-			},
-		}
-
-		if message.ReplyCount > 0 {
-			backfillThreadInsertParams = append(backfillThreadInsertParams, river.InsertManyParams{
-				Args: background.BackfillThreadWorkerArgs{
-					ChannelID: job.Args.ChannelID,
-					SlackTS:   message.Timestamp,
-				},
-			})
+			Attrs:     internal.MessageAttrs(message),
 		}
 	}
 
@@ -109,11 +103,8 @@ func (w *ChannelOnboardWorker) Work(ctx context.Context, job *river.Job[backgrou
 		return fmt.Errorf("adding messages to channel %s: %w", job.Args.ChannelID, err)
 	}
 
-	if len(backfillThreadInsertParams) > 0 {
-		client := river.ClientFromContext[pgx.Tx](ctx)
-		if _, err := client.InsertManyTx(ctx, tx, backfillThreadInsertParams); err != nil {
-			return fmt.Errorf("inserting backfill thread insert params: %w", err)
-		}
+	if err := insertBackfillThreadJobs(ctx, river.ClientFromContext[pgx.Tx](ctx), tx, job.Args.ChannelID, messages); err != nil {
+		return err
 	}
 
 	if _, err = river.JobCompleteTx[*riverpgxv5.Driver](ctx, tx, job); err != nil {
@@ -122,3 +113,31 @@ func (w *ChannelOnboardWorker) Work(ctx context.Context, job *river.Job[backgrou
 
 	return tx.Commit(ctx)
 }
+
+// insertBackfillThreadJobs schedules a backfill of every thread started by
+// messages. Thread jobs are unique by channel and thread, and re-onboarding a
+// channel enqueues threads that may still have a job; unlike
+// InsertManyFastTx, InsertManyTx skips those duplicates instead of failing.
+func insertBackfillThreadJobs(ctx context.Context, client *river.Client[pgx.Tx], tx pgx.Tx, channelID string, messages []slack.Message) error {
+	var params []river.InsertManyParams
+	for _, message := range messages {
+		if message.ReplyCount > 0 {
+			params = append(params, river.InsertManyParams{
+				Args: background.BackfillThreadWorkerArgs{
+					ChannelID: channelID,
+					SlackTS:   message.Timestamp,
+				},
+			})
+		}
+	}
+
+	if len(params) == 0 {
+		return nil
+	}
+
+	if _, err := client.InsertManyTx(ctx, tx, params); err != nil {
+		return fmt.Errorf("inserting backfill thread jobs for channel %s: %w", channelID, err)
+	}
+
+	return nil
+}
@@ -0,0 +1,48 @@
+package channel_onboard_worker
+
+import (
+	"testing"
+
+	"github.com/riverqueue/river"
+	"github.com/riverqueue/river/riverdriver/riverpgxv5"
+	"github.com/riverqueue/river/rivertype"
+	"github.com/slack-go/slack"
+	"github.com/stretchr/testify/require"
+
+	"github.com/dynoinc/ratchet/internal/background"
+	"github.com/dynoinc/ratchet/internal/storage/storagetest"
+)
+
+func TestInsertBackfillThreadJobsReonboard(t *testing.T) {
+	db := storagetest.NewDB(t)
+	ctx := t.Context()
+
+	client, err := river.NewClient(riverpgxv5.New(db), &river.Config{})
+	require.NoError(t, err)
+
+	messages := []slack.Message{
+		{Msg: slack.Msg{Timestamp: "1700000000.000001", ReplyCount: 2}},
+		{Msg: slack.Msg{Timestamp: "1700000000.000002"}},
+		{Msg: slack.Msg{Timestamp: "1700000000.000003", ReplyCount: 1}},
+	}
+
+	// Onboarding the same channel twice must not fail on the thread jobs
+	// that are still around from the first run.
+	for range 2 {
+		tx, err := db.Begin(ctx)
+		require.NoError(t, err)
+
+		require.NoError(t, insertBackfillThreadJobs(ctx, client, tx, "C0706000000", messages))
+		require.NoError(t, tx.Commit(ctx))
+	}
+
+	jobs, err := client.JobList(ctx, river.NewJobListParams().
+		Kinds(background.BackfillThreadWorkerArgs{}.Kind()).
+		States(rivertype.JobStateAvailable))
+	require.NoError(t, err)
+	require.Len(t, jobs.Jobs, 2)
+
+	for _, job := range jobs.Jobs {
+		require.Equal(t, background.QueueBackfill, job.Queue)
+	}
+}
@@ -38,11 +38,21 @@ func (m *sentryMiddleware) Work(ctx context.Context, job *rivertype.JobRow, doIn
 	return nil
 }
 
-func New(db *pgxpool.Pool, workers *river.Workers, periodicJobs []*river.PeriodicJob) (*river.Client[pgx.Tx], error) {
+type Config struct {
+	// MaxWorkers bounds the default queue.
+	MaxWorkers int `split_words:"true" default:"10"`
+	// BackfillMaxWorkers bounds concurrent Slack history and replies fetches.
+	BackfillMaxWorkers int `split_words:"true" default:"8"`
+}
+
+func New(db *pgxpool.Pool, c Config, workers *river.Workers, periodicJobs []*river.PeriodicJob) (*river.Client[pgx.Tx], error) {
 	return river.NewClient(riverpgxv5.New(db), &river.Config{
 		Queues: map[string]river.QueueConfig{
 			river.QueueDefault: {
-				MaxWorkers: 10,
+				MaxWorkers: c.MaxWorkers,
+			},
+			QueueBackfill: {
+				MaxWorkers: c.BackfillMaxWorkers,
 			},
 		},
 		PeriodicJobs: periodicJobs,
@@ -8,6 +8,8 @@ import (
 	"log/slog"
 	"path/filepath"
 	"strings"
+	"sync"
+	"sync/atomic"
 	"time"
 	"unicode/utf8"
 
@@ -29,12 +31,46 @@ type documentRefreshWorker struct {
 
 	bot       *internal.Bot
 	llmClient llm.Client
+
+	// attempts counts the failed refreshes of each document version, keyed
+	// by documentKey.
+	attemptsMu sync.Mutex
+	attempts   map[string]int
+}
+
+// maxDocumentAttempts bounds how many refreshes retry a document version
+// that fails to process. After that the revision is advanced past it, so a
+// document the embedding model always rejects cannot pin the revision.
+const maxDocumentAttempts = 3
+
+func documentKey(url string, update docs.Update) string {
+	return url + "\x00" + update.Path + "\x00" + update.BlobSHA
+}
+
+// recordAttempt records the outcome of processing a document version and
+// reports whether it should hold back the revision to be retried.
+func (d *documentRefreshWorker) recordAttempt(key string, err error) bool {
+	d.attemptsMu.Lock()
+	defer d.attemptsMu.Unlock()
+
+	if err == nil {
+		delete(d.attempts, key)
+		return false
+	}
+
+	d.attempts[key]++
+	if d.attempts[key] >= maxDocumentAttempts {
+		delete(d.attempts, key)
+		return false
+	}
+	return true
 }
 
 func New(bot *internal.Bot, llmClient llm.Client) river.Worker[background.DocumentationRefreshArgs] {
 	return &documentRefreshWorker{
 		bot:       bot,
 		llmClient: llmClient,
+		attempts:  make(map[string]int),
 	}
 }
 
@@ -50,16 +86,33 @@ func (d *documentRefreshWorker) Work(ctx context.Context, job *river.Job[backgro
 	}
 
 	it, newRevision, errf := job.Args.Source.ChangesSince(ctx, status.Revision)
+	if newRevision == status.Revision {
+		// Nothing changed since the last refresh, or the source failed before
+		// resolving its revision; either way there is nothing to walk or write.
+		if err := errf(); err != nil {
+			return fmt.Errorf("getting changes since revision %s: %w", status.Revision, err)
+		}
 
+		return nil
+	}
+
+	var failed atomic.Int64
 	g, gctx := errgroup.WithContext(ctx)
 	g.SetLimit(8)
 	for update := range it {
 		g.Go(func() error {
-			if err := processUpdate(gctx, d.bot, d.llmClient, job.Args.Source, update); err != nil {
+			err := processUpdate(gctx, d.bot, d.llmClient, job.Args.Source, update)
+			// A cancelled job says nothing about the document itself.
+			retry := gctx.Err() != nil || d.recordAttempt(documentKey(url, update), err)
+			if err != nil {
 				slog.Error("Error processing document update",
 					"path", update.Path,
+					"retry", retry,
 					"error", err)
 			}
+			if retry {
+				failed.Add(1)
+			}
 
 			return nil
 		})
@@ -76,12 +129,23 @@ func (d *documentRefreshWorker) Work(ctx context.Context, job *river.Job[backgro
 	}
 	defer tx.Rollback(ctx)
 
-	qtx := dbschema.New(tx)
-	if err := qtx.UpdateDocumentationSource(ctx, dbschema.UpdateDocumentationSourceParams{
-		Url:      url,
-		Revision: newRevision,
-	}); err != nil {
-		return fmt.Errorf("updating documentation status for URL %s: %w", url, err)
+	// Only advance the revision once every document made it in or ran out of
+	// attempts. Otherwise the next refresh walks the same changes again and
+	// retries the failed documents; the ones already stored are skipped by
+	// their blob SHA.
+	if n := failed.Load(); n > 0 {
+		slog.WarnContext(ctx, "not advancing documentation revision",
+			"url", url,
+			"revision", newRevision,
+			"failed", n)
+	} else {
+		qtx := dbschema.New(tx)
+		if err := qtx.UpdateDocumentationSource(ctx, dbschema.UpdateDocumentationSourceParams{
+			Url:      url,
+			Revision: newRevision,
+		}); err != nil {
+			return fmt.Errorf("updating documentation status for URL %s: %w", url, err)
+		}
 	}
 
 	if _, err = river.JobCompleteTx[*riverpgxv5.Driver](ctx, tx, job); err != nil {
@@ -98,6 +162,10 @@ const (
 	overlapTokens    = 100
 )
 
+// embeddingConcurrency bounds the embedding requests in flight for a single
+// document. Documents themselves are processed eight at a time.
+const embeddingConcurrency = 4
+
 var (
 	chunkSize    = tokensPerChunk * avgCharsPerToken // ≃ 4 000 chars
 	chunkOverlap = overlapTokens * avgCharsPerToken  // ≃ 400 chars
@@ -264,21 +332,12 @@ func processUpdate(ctx context.Context, bot *internal.Bot, llmClient llm.Client,
 
 	chunks := make([]string, 0, len(parts)+1)
 	chunkIndices := make([]int32, 0, len(parts)+1)
-	embeddings := make([]*pgvector.Vector, 0, len(parts)+1)
 
 	// Only add metadata as a chunk with embedding if metadata is non-empty
 	var startIndex int32 = 0
 	if len(meta) > 0 {
-		metadataChunk := fmt.Sprintf("Metadata: %v", meta)
-		embedding, err := llmClient.GenerateEmbedding(ctx, "documentation", metadataChunk)
-		if err != nil {
-			return fmt.Errorf("generating embedding for metadata: %w", err)
-		}
-		vec := pgvector.NewVector(embedding)
-
-		chunks = append(chunks, metadataChunk)
+		chunks = append(chunks, fmt.Sprintf("Metadata: %v", meta))
 		chunkIndices = append(chunkIndices, 0)
-		embeddings = append(embeddings, &vec)
 		startIndex = 1
 	}
 
@@ -287,15 +346,29 @@ func processUpdate(ctx context.Context, bot *internal.Bot, llmClient llm.Client,
 			continue
 		}
 
-		embedding, err := llmClient.GenerateEmbedding(ctx, "documentation", part)
-		if err != nil {
-			return fmt.Errorf("generating embedding for chunk %d: %w", i, err)
-		}
-		vec := pgvector.NewVector(embedding)
-
 		chunks = append(chunks, part)
 		chunkIndices = append(chunkIndices, int32(i)+startIndex)
-		embeddings = append(embeddings, &vec)
+	}
+
+	// Embed the chunks of a document concurrently; each is an independent
+	// round trip to the embedding model.
+	embeddings := make([]*pgvector.Vector, len(chunks))
+	g, gctx := errgroup.WithContext(ctx)
+	g.SetLimit(embeddingConcurrency)
+	for i, chunk := range chunks {
+		g.Go(func() error {
+			embedding, err := llmClient.GenerateEmbedding(gctx, "documentation", chunk)
+			if err != nil {
+				return fmt.Errorf("generating embedding for chunk %d: %w", chunkIndices[i], err)
+			}
+
+			vec := pgvector.NewVector(embedding)
+			embeddings[i] = &vec
+			return nil
+		})
+	}
+	if err := g.Wait(); err != nil {
+		return err
 	}
 
 	if len(chunkIndices) == 0 {
@@ -1,6 +1,7 @@
 package documentation_refresh_worker
 
 import (
+	"errors"
 	"testing"
 
 	"github.com/stretchr/testify/require"
@@ -215,3 +216,20 @@ func generateLargeContent(size int) string {
 
 	return result
 }
+
+func TestRecordAttempt(t *testing.T) {
+	d := &documentRefreshWorker{attempts: make(map[string]int)}
+	errEmbed := errors.New("embedding failed")
+
+	// A failing document holds the revision back until it runs out of attempts.
+	for range maxDocumentAttempts - 1 {
+		require.True(t, d.recordAttempt("doc", errEmbed))
+	}
+	require.False(t, d.recordAttempt("doc", errEmbed))
+	require.Empty(t, d.attempts)
+
+	// A success resets the count.
+	require.True(t, d.recordAttempt("doc", errEmbed))
+	require.False(t, d.recordAttempt("doc", nil))
+	require.Empty(t, d.attempts)
+}
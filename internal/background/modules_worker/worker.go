@@ -20,17 +20,41 @@ import (
 type Worker struct {
 	river.WorkerDefaults[background.ModulesWorkerArgs]
 
-	bot     *internal.Bot
-	modules []modules.Handler
-	tracer  trace.Tracer
+	bot    *internal.Bot
+	tracer trace.Tracer
+
+	// Modules to run, resolved once from the configured handlers by message
+	// kind and by whether they take part in backfill.
+	modules               []modules.Handler
+	backfillModules       []modules.Handler
+	threadModules         []modules.Handler
+	backfillThreadModules []modules.Handler
 }
 
-func New(bot *internal.Bot, modules []modules.Handler) *Worker {
-	return &Worker{
+func New(bot *internal.Bot, handlers []modules.Handler) *Worker {
+	w := &Worker{
 		bot:     bot,
-		modules: modules,
 		tracer:  otel.Tracer("ratchet.modules_worker"),
+		modules: handlers,
 	}
+
+	for _, module := range handlers {
+		_, isThreadHandler := module.(modules.ThreadHandler)
+		backfill, ok := module.(modules.OnBackfillMessage)
+		enabledForBackfill := ok && backfill.EnabledForBackfill()
+
+		if enabledForBackfill {
+			w.backfillModules = append(w.backfillModules, module)
+		}
+		if isThreadHandler {
+			w.threadModules = append(w.threadModules, module)
+			if enabledForBackfill {
+				w.backfillThreadModules = append(w.backfillThreadModules, module)
+			}
+		}
+	}
+
+	return w
 }
 
 func (w *Worker) Timeout(job *river.Job[background.ModulesWorkerArgs]) time.Duration {
@@ -56,55 +80,29 @@ func (w *Worker) executeModuleWithTracing(ctx context.Context, module modules.Ha
 }
 
 func (w *Worker) Work(ctx context.Context, job *river.Job[background.ModulesWorkerArgs]) error {
-	if job.Args.ParentTS == "" {
-		return w.handleMessage(ctx, job)
+	isThreadMessage := job.Args.ParentTS != ""
+
+	var handlers []modules.Handler
+	switch {
+	case isThreadMessage && job.Args.IsBackfill:
+		handlers = w.backfillThreadModules
+	case isThreadMessage:
+		handlers = w.threadModules
+	case job.Args.IsBackfill:
+		handlers = w.backfillModules
+	default:
+		handlers = w.modules
 	}
 
-	return w.handleThreadMessage(ctx, job)
-}
-
-func (w *Worker) handleThreadMessage(ctx context.Context, job *river.Job[background.ModulesWorkerArgs]) error {
-	msg, err := w.bot.GetMessage(ctx, job.Args.ChannelID, job.Args.SlackTS)
-	if err != nil {
-		if errors.Is(err, internal.ErrMessageNotFound) {
-			slog.WarnContext(ctx, "thread message not found", "channel_id", job.Args.ChannelID, "slack_ts", job.Args.SlackTS)
-			return nil
-		}
-
-		return err
+	// Backfilled replies usually have no module to run; don't load them.
+	if len(handlers) == 0 {
+		return nil
 	}
 
-	hub := sentry.GetHubFromContext(ctx)
-	scope := hub.Scope()
-	scope.SetTag("channel_id", job.Args.ChannelID)
-	scope.SetTag("slack_ts", job.Args.SlackTS)
-	scope.SetTag("parent_ts", job.Args.ParentTS)
-
-	for _, module := range w.modules {
-		threadHandler, ok := module.(modules.ThreadHandler)
-		if !ok {
-			continue
-		}
-
-		if job.Args.IsBackfill {
-			if enabled, ok := module.(modules.OnBackfillMessage); !ok || !enabled.EnabledForBackfill() {
-				continue
-			}
-		}
-
-		w.executeModuleWithTracing(ctx, module, job.Args.ChannelID, job.Args.SlackTS, func(ctx context.Context) error {
-			return threadHandler.OnThreadMessage(ctx, job.Args.ChannelID, job.Args.SlackTS, job.Args.ParentTS, msg.Attrs)
-		})
-	}
-
-	return nil
-}
-
-func (w *Worker) handleMessage(ctx context.Context, job *river.Job[background.ModulesWorkerArgs]) error {
 	msg, err := w.bot.GetMessage(ctx, job.Args.ChannelID, job.Args.SlackTS)
 	if err != nil {
 		if errors.Is(err, internal.ErrMessageNotFound) {
-			slog.WarnContext(ctx, "thread message not found", "channel_id", job.Args.ChannelID, "thread_ts", job.Args.ParentTS)
+			slog.WarnContext(ctx, "message not found", "channel_id", job.Args.ChannelID, "slack_ts", job.Args.SlackTS, "parent_ts", job.Args.ParentTS)
 			return nil
 		}
 
@@ -115,15 +113,16 @@ func (w *Worker) handleMessage(ctx context.Context, job *river.Job[background.Mo
 	scope := hub.Scope()
 	scope.SetTag("channel_id", job.Args.ChannelID)
 	scope.SetTag("slack_ts", job.Args.SlackTS)
+	if isThreadMessage {
+		scope.SetTag("parent_ts", job.Args.ParentTS)
+	}
 
-	for _, module := range w.modules {
-		if job.Args.IsBackfill {
-			if enabled, ok := module.(modules.OnBackfillMessage); !ok || !enabled.EnabledForBackfill() {
-				continue
+	for _, module := range handlers {
+		w.executeModuleWithTracing(ctx, module, job.Args.ChannelID, job.Args.SlackTS, func(ctx context.Context) error {
+			if isThreadMessage {
+				return module.(modules.ThreadHandler).OnThreadMessage(ctx, job.Args.ChannelID, job.Args.SlackTS, job.Args.ParentTS, msg.Attrs)
 			}
-		}
 
-		w.executeModuleWithTracing(ctx, module, job.Args.ChannelID, job.Args.SlackTS, func(ctx context.Context) error {
 			return module.OnMessage(ctx, job.Args.ChannelID, job.Args.SlackTS, msg.Attrs)
 		})
 	}
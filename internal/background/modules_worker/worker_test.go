@@ -0,0 +1,155 @@
+package modules_worker
+
+import (
+	"context"
+	"encoding/json"
+	"testing"
+
+	"github.com/getsentry/sentry-go"
+	"github.com/riverqueue/river"
+	"github.com/stretchr/testify/require"
+
+	"github.com/dynoinc/ratchet/internal"
+	"github.com/dynoinc/ratchet/internal/background"
+	"github.com/dynoinc/ratchet/internal/modules"
+	"github.com/dynoinc/ratchet/internal/storage/schema"
+	"github.com/dynoinc/ratchet/internal/storage/schema/dto"
+	"github.com/dynoinc/ratchet/internal/storage/storagetest"
+)
+
+// messageModule handles top-level messages only.
+type messageModule struct {
+	name  string
+	calls *[]string
+}
+
+func (m messageModule) Name() string { return m.name }
+
+func (m messageModule) OnMessage(ctx context.Context, channelID string, slackTS string, msg dto.MessageAttrs) error {
+	*m.calls = append(*m.calls, m.name+".OnMessage")
+	return nil
+}
+
+// threadModule also handles thread replies.
+type threadModule struct{ messageModule }
+
+func (m threadModule) OnThreadMessage(ctx context.Context, channelID string, slackTS string, parentTS string, msg dto.MessageAttrs) error {
+	*m.calls = append(*m.calls, m.name+".OnThreadMessage")
+	return nil
+}
+
+// backfillModule handles top-level messages, including backfilled ones.
+type backfillModule struct{ messageModule }
+
+func (m backfillModule) EnabledForBackfill() bool { return true }
+
+// backfillThreadModule handles thread replies, including backfilled ones.
+type backfillThreadModule struct{ threadModule }
+
+func (m backfillThreadModule) EnabledForBackfill() bool { return true }
+
+func TestWorkDispatch(t *testing.T) {
+	db := storagetest.NewDB(t)
+	ctx := sentry.SetHubOnContext(t.Context(), sentry.CurrentHub().Clone())
+
+	const (
+		channelID = "C0706000000"
+		parentTS  = "1714358400.000000"
+		replyTS   = "1714358401.000000"
+	)
+
+	_, err := schema.New(db).StartChannelOnboarding(ctx, schema.StartChannelOnboardingParams{
+		ID:    channelID,
+		Attrs: dto.ChannelAttrs{OnboardingStatus: dto.OnboardingStatusFinished},
+	})
+	require.NoError(t, err)
+
+	attrs, err := json.Marshal(dto.MessageAttrs{Message: dto.SlackMessage{Text: "hello"}})
+	require.NoError(t, err)
+	_, err = schema.New(db).AddMessages(ctx, schema.AddMessagesParams{
+		ChannelID: channelID,
+		Ts:        []string{parentTS},
+		Attrs:     [][]byte{attrs},
+	})
+	require.NoError(t, err)
+	_, err = schema.New(db).AddThreadMessages(ctx, schema.AddThreadMessagesParams{
+		ChannelID: channelID,
+		ParentTs:  []string{parentTS},
+		Ts:        []string{replyTS},
+		Attrs:     [][]byte{attrs},
+	})
+	require.NoError(t, err)
+
+	tests := []struct {
+		name      string
+		db        bool
+		args      background.ModulesWorkerArgs
+		wantCalls []string
+	}{
+		{
+			name: "message",
+			db:   true,
+			args: background.ModulesWorkerArgs{ChannelID: channelID, SlackTS: parentTS},
+			wantCalls: []string{
+				"message.OnMessage",
+				"thread.OnMessage",
+				"backfill.OnMessage",
+				"backfillThread.OnMessage",
+			},
+		},
+		{
+			name: "thread message",
+			db:   true,
+			args: background.ModulesWorkerArgs{ChannelID: channelID, SlackTS: replyTS, ParentTS: parentTS},
+			wantCalls: []string{
+				"thread.OnThreadMessage",
+				"backfillThread.OnThreadMessage",
+			},
+		},
+		{
+			name: "backfill message",
+			db:   true,
+			args: background.ModulesWorkerArgs{ChannelID: channelID, SlackTS: parentTS, IsBackfill: true},
+			wantCalls: []string{
+				"backfill.OnMessage",
+				"backfillThread.OnMessage",
+			},
+		},
+		{
+			name: "backfill thread message",
+			db:   true,
+			args: background.ModulesWorkerArgs{ChannelID: channelID, SlackTS: replyTS, ParentTS: parentTS, IsBackfill: true},
+			wantCalls: []string{
+				"backfillThread.OnThreadMessage",
+			},
+		},
+		{
+			// Without a database, loading the message would fail the test.
+			name: "no handler returns early",
+			args: background.ModulesWorkerArgs{ChannelID: channelID, SlackTS: replyTS, ParentTS: parentTS, IsBackfill: true},
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var calls []string
+			handlers := []modules.Handler{
+				messageModule{name: "message", calls: &calls},
+			}
+			bot := internal.New(nil)
+			if tt.db {
+				bot = internal.New(db)
+				handlers = append(handlers,
+					threadModule{messageModule{name: "thread", calls: &calls}},
+					backfillModule{messageModule{name: "backfill", calls: &calls}},
+					backfillThreadModule{threadModule{messageModule{name: "backfillThread", calls: &calls}}},
+				)
+			}
+
+			w := New(bot, handlers)
+			err := w.Work(ctx, &river.Job[background.ModulesWorkerArgs]{Args: tt.args})
+			require.NoError(t, err)
+			require.Equal(t, tt.wantCalls, calls)
+		})
+	}
+}
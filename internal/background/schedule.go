@@ -0,0 +1,29 @@
+package background
+
+import (
+	"math/rand/v2"
+	"time"
+
+	"github.com/riverqueue/river"
+)
+
+type jitteredInterval struct {
+	interval time.Duration
+	jitter   time.Duration
+}
+
+// JitteredInterval returns a periodic schedule that runs every interval plus
+// a random delay of up to jitter, so that periodic jobs registered together
+// don't all hit their upstream in the same instant.
+func JitteredInterval(interval, jitter time.Duration) river.PeriodicSchedule {
+	return &jitteredInterval{interval: interval, jitter: jitter}
+}
+
+func (s *jitteredInterval) Next(current time.Time) time.Time {
+	next := current.Add(s.interval)
+	if s.jitter > 0 {
+		next = next.Add(rand.N(s.jitter))
+	}
+
+	return next
+}
@@ -2,16 +2,18 @@ package internal
 
 import (
 	"context"
+	"encoding/json"
 	"errors"
 	"fmt"
 	"log/slog"
+	"sync"
+	"time"
 
-	"github.com/jackc/pgerrcode"
 	"github.com/jackc/pgx/v5"
-	"github.com/jackc/pgx/v5/pgconn"
 	"github.com/jackc/pgx/v5/pgtype"
 	"github.com/jackc/pgx/v5/pgxpool"
 	"github.com/riverqueue/river"
+	"github.com/slack-go/slack"
 	"github.com/slack-go/slack/slackevents"
 
 	"github.com/dynoinc/ratchet/internal/background"
@@ -35,10 +37,72 @@ type Bot struct {
 	DB          *pgxpool.Pool
 	DocsConfig  *docs.Config
 	RiverClient *river.Client[pgx.Tx]
+
+	queries *schema.Queries
+
+	// knownChannels holds the IDs of channels whose row already has
+	// attributes, so EnsureChannel can skip the database for them.
+	knownChannels channelSet
+}
+
+const (
+	knownChannelTTL  = 30 * time.Minute
+	maxKnownChannels = 1024
+
+	// maxInsertBatchSize bounds the number of rows sent in a single bulk
+	// insert statement, keeping the array parameters of large backfills
+	// to a reasonable size.
+	maxInsertBatchSize = 1000
+)
+
+// channelSet is a bounded set of channel IDs whose entries expire after
+// knownChannelTTL.
+type channelSet struct {
+	mu      sync.Mutex
+	expires map[string]time.Time
+	// now returns the current time; nil means time.Now. Tests override it.
+	now func() time.Time
+}
+
+func (s *channelSet) currentTime() time.Time {
+	if s.now != nil {
+		return s.now()
+	}
+	return time.Now()
+}
+
+func (s *channelSet) contains(channelID string) bool {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	expires, ok := s.expires[channelID]
+	return ok && s.currentTime().Before(expires)
+}
+
+func (s *channelSet) add(channelID string) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	now := s.currentTime()
+	if s.expires == nil {
+		s.expires = make(map[string]time.Time)
+	}
+	if len(s.expires) >= maxKnownChannels {
+		for id, expires := range s.expires {
+			if !now.Before(expires) {
+				delete(s.expires, id)
+			}
+		}
+		if len(s.expires) >= maxKnownChannels {
+			return
+		}
+	}
+
+	s.expires[channelID] = now.Add(knownChannelTTL)
 }
 
 func New(db *pgxpool.Pool) *Bot {
-	return &Bot{DB: db}
+	return &Bot{DB: db, queries: schema.New(db)}
 }
 
 func (b *Bot) Init(riverClient *river.Client[pgx.Tx], docsConfig *docs.Config) error {
@@ -48,7 +112,7 @@ func (b *Bot) Init(riverClient *river.Client[pgx.Tx], docsConfig *docs.Config) e
 }
 
 func (b *Bot) UpdateChannel(ctx context.Context, tx pgx.Tx, params schema.UpdateChannelAttrsParams) error {
-	qtx := schema.New(b.DB)
+	qtx := b.queries
 	if tx != nil {
 		qtx = qtx.WithTx(tx)
 	}
@@ -61,38 +125,59 @@ func (b *Bot) UpdateChannel(ctx context.Context, tx pgx.Tx, params schema.Update
 }
 
 func (b *Bot) EnsureChannel(ctx context.Context, tx pgx.Tx, channelID string) (bool, error) {
-	qtx := schema.New(b.DB).WithTx(tx)
+	if b.knownChannels.contains(channelID) {
+		return false, nil
+	}
 
-	channel, err := qtx.AddChannel(ctx, channelID)
+	// Insert the channel as onboarding, or mark an existing channel that was
+	// never onboarded, in a single statement. No row comes back when the
+	// channel already has attributes.
+	_, err := b.queries.WithTx(tx).StartChannelOnboarding(ctx, schema.StartChannelOnboardingParams{
+		ID: channelID,
+		Attrs: dto.ChannelAttrs{
+			OnboardingStatus: dto.OnboardingStatusStarted,
+		},
+	})
+	if errors.Is(err, pgx.ErrNoRows) {
+		// Channel attributes are never cleared, so the channel does not
+		// need to be checked again for a while.
+		b.knownChannels.add(channelID)
+		return false, nil
+	}
 	if err != nil {
 		return false, fmt.Errorf("adding channel %s: %w", channelID, err)
 	}
 
-	onboarding := false
-	if channel.Attrs == (dto.ChannelAttrs{}) {
-		if err := qtx.UpdateChannelAttrs(ctx, schema.UpdateChannelAttrsParams{
-			ID: channelID,
-			Attrs: dto.ChannelAttrs{
-				OnboardingStatus: dto.OnboardingStatusStarted,
-			},
-		}); err != nil {
-			return false, fmt.Errorf("updating channel %s: %w", channelID, err)
-		}
+	if _, err := b.RiverClient.InsertTx(ctx, tx, background.ChannelOnboardWorkerArgs{
+		ChannelID: channelID,
+	}, nil); err != nil {
+		return false, fmt.Errorf("scheduling channel onboarding for channel %s: %w", channelID, err)
+	}
 
-		if _, err := b.RiverClient.InsertTx(ctx, tx, background.ChannelOnboardWorkerArgs{
-			ChannelID: channelID,
-		}, nil); err != nil {
-			return false, fmt.Errorf("scheduling channel onboarding for channel %s: %w", channelID, err)
-		}
+	return true, nil
+}
 
-		onboarding = true
-	}
+// Message is a top-level Slack message to store with AddMessage.
+type Message struct {
+	ChannelID string
+	Ts        string
+	Attrs     dto.MessageAttrs
+}
 
-	return onboarding, nil
+// ThreadMessage is a Slack thread reply to store with AddThreadMessages.
+type ThreadMessage struct {
+	ChannelID string
+	ParentTs  string
+	Ts        string
+	Attrs     dto.MessageAttrs
 }
 
-func (b *Bot) AddMessage(ctx context.Context, tx pgx.Tx, params []schema.AddMessageParams, source messageSource) error {
-	qtx := schema.New(b.DB).WithTx(tx)
+func (b *Bot) AddMessage(ctx context.Context, tx pgx.Tx, params []Message, source messageSource) error {
+	if len(params) == 0 {
+		return nil
+	}
+
+	qtx := b.queries.WithTx(tx)
 
 	channelID := params[0].ChannelID
 	if _, err := b.EnsureChannel(ctx, tx, channelID); err != nil {
@@ -106,28 +191,64 @@ func (b *Bot) AddMessage(ctx context.Context, tx pgx.Tx, params []schema.AddMess
 		return fmt.Errorf("deleting old messages for channel %s: %w", channelID, err)
 	}
 
-	var jobs []river.InsertManyParams
-	for _, param := range params {
-		inserted, err := qtx.AddMessage(ctx, param)
+	batch := schema.AddMessagesParams{
+		ChannelID: channelID,
+		Ts:        make([]string, len(params)),
+		Attrs:     make([][]byte, len(params)),
+	}
+	for i, param := range params {
+		attrs, err := json.Marshal(param.Attrs)
 		if err != nil {
-			return fmt.Errorf("adding message (ts=%s) to channel %s: %w", param.Ts, param.ChannelID, err)
+			return fmt.Errorf("marshaling message (ts=%s) attrs: %w", param.Ts, err)
 		}
 
-		if !inserted {
-			continue
+		batch.Ts[i] = param.Ts
+		batch.Attrs[i] = attrs
+	}
+
+	var insertedTs []string
+	for start := 0; start < len(params); start += maxInsertBatchSize {
+		end := min(start+maxInsertBatchSize, len(params))
+		ts, err := qtx.AddMessages(ctx, schema.AddMessagesParams{
+			ChannelID: channelID,
+			Ts:        batch.Ts[start:end],
+			Attrs:     batch.Attrs[start:end],
+		})
+		if err != nil {
+			return fmt.Errorf("adding %d messages to channel %s: %w", end-start, channelID, err)
 		}
 
-		var insertOpts *river.InsertOpts
-		if source == SourceBackfill {
-			insertOpts = &river.InsertOpts{
-				// Avoid overloading the worker with backfill jobs
-				Priority: 4,
-			}
+		insertedTs = append(insertedTs, ts...)
+	}
+
+	if len(insertedTs) == 0 {
+		return nil
+	}
+
+	inserted := make(map[string]struct{}, len(insertedTs))
+	for _, ts := range insertedTs {
+		inserted[ts] = struct{}{}
+	}
+
+	var insertOpts *river.InsertOpts
+	if source == SourceBackfill {
+		insertOpts = &river.InsertOpts{
+			// Avoid overloading the worker with backfill jobs
+			Priority: 4,
 		}
+	}
+
+	jobs := make([]river.InsertManyParams, 0, len(insertedTs))
+	for _, param := range params {
+		if _, ok := inserted[param.Ts]; !ok {
+			continue
+		}
+		// Guard against duplicate timestamps in the same batch.
+		delete(inserted, param.Ts)
 
 		jobs = append(jobs, river.InsertManyParams{
 			Args: background.ModulesWorkerArgs{
-				ChannelID:  param.ChannelID,
+				ChannelID:  channelID,
 				SlackTS:    param.Ts,
 				IsBackfill: source == SourceBackfill,
 			},
@@ -135,54 +256,111 @@ func (b *Bot) AddMessage(ctx context.Context, tx pgx.Tx, params []schema.AddMess
 		})
 	}
 
-	if len(jobs) > 0 {
-		if _, err := b.RiverClient.InsertManyTx(ctx, tx, jobs); err != nil {
-			return fmt.Errorf("scheduling message classification for channel %s: %w", channelID, err)
-		}
+	if _, err := b.RiverClient.InsertManyFastTx(ctx, tx, jobs); err != nil {
+		return fmt.Errorf("scheduling message classification for channel %s: %w", channelID, err)
 	}
 
 	return nil
 }
 
-func (b *Bot) AddThreadMessages(ctx context.Context, tx pgx.Tx, params []schema.AddThreadMessageParams, source messageSource) error {
-	qtx := schema.New(b.DB).WithTx(tx)
+func (b *Bot) AddThreadMessages(ctx context.Context, tx pgx.Tx, params []ThreadMessage, source messageSource) error {
+	if len(params) == 0 {
+		return nil
+	}
 
-	var jobs []river.InsertManyParams
-	for _, param := range params {
-		inserted, err := qtx.AddThreadMessage(ctx, param)
-		if err != nil {
-			var pgErr *pgconn.PgError
-			if errors.As(err, &pgErr) && pgErr.Code == pgerrcode.ForeignKeyViolation {
-				continue
-			}
+	qtx := b.queries.WithTx(tx)
 
-			return fmt.Errorf("adding thread message to channel %s (ts=%s): %w", param.ChannelID, param.Ts, err)
+	channelID := params[0].ChannelID
+	batch := schema.AddThreadMessagesParams{
+		ChannelID: channelID,
+		ParentTs:  make([]string, len(params)),
+		Ts:        make([]string, len(params)),
+		Attrs:     make([][]byte, len(params)),
+	}
+	parents := make(map[string]string, len(params))
+	for i, param := range params {
+		attrs, err := json.Marshal(param.Attrs)
+		if err != nil {
+			return fmt.Errorf("marshaling thread message (ts=%s) attrs: %w", param.Ts, err)
 		}
 
-		if !inserted {
-			continue
+		batch.ParentTs[i] = param.ParentTs
+		batch.Ts[i] = param.Ts
+		batch.Attrs[i] = attrs
+		parents[param.Ts] = param.ParentTs
+	}
+
+	var insertedTs []string
+	for start := 0; start < len(params); start += maxInsertBatchSize {
+		end := min(start+maxInsertBatchSize, len(params))
+		ts, err := qtx.AddThreadMessages(ctx, schema.AddThreadMessagesParams{
+			ChannelID: channelID,
+			ParentTs:  batch.ParentTs[start:end],
+			Ts:        batch.Ts[start:end],
+			Attrs:     batch.Attrs[start:end],
+		})
+		if err != nil {
+			return fmt.Errorf("adding %d thread messages to channel %s: %w", end-start, channelID, err)
 		}
 
+		insertedTs = append(insertedTs, ts...)
+	}
+
+	if len(insertedTs) == 0 {
+		return nil
+	}
+
+	jobs := make([]river.InsertManyParams, 0, len(insertedTs))
+	for _, ts := range insertedTs {
 		jobs = append(jobs, river.InsertManyParams{
 			Args: background.ModulesWorkerArgs{
-				ChannelID:  param.ChannelID,
-				SlackTS:    param.Ts,
-				ParentTS:   param.ParentTs,
+				ChannelID:  channelID,
+				SlackTS:    ts,
+				ParentTS:   parents[ts],
 				IsBackfill: source == SourceBackfill,
 			},
 		})
 	}
 
-	if len(jobs) > 0 {
-		if _, err := b.RiverClient.InsertManyTx(ctx, tx, jobs); err != nil {
-			return fmt.Errorf("scheduling thread message backfill for channel %s: %w", params[0].ChannelID, err)
-		}
+	if _, err := b.RiverClient.InsertManyFastTx(ctx, tx, jobs); err != nil {
+		return fmt.Errorf("scheduling thread message backfill for channel %s: %w", channelID, err)
 	}
 
 	return nil
 }
 
+// MessageAttrs converts a message returned by the Slack API into the
+// attributes stored for it.
+func MessageAttrs(message slack.Message) dto.MessageAttrs {
+	// Most messages have no reactions; leave the map nil for them.
+	var reactions map[string]int
+	if len(message.Reactions) > 0 {
+		reactions = make(map[string]int, len(message.Reactions))
+		for _, reaction := range message.Reactions {
+			reactions[reaction.Name] = reaction.Count
+		}
+	}
+
+	return dto.MessageAttrs{
+		Message: dto.SlackMessage{
+			SubType:     message.SubType,
+			Text:        message.Text,
+			User:        message.User,
+			BotID:       message.BotID,
+			BotUsername: message.Username,
+		},
+		Reactions: reactions,
+	}
+}
+
 func (b *Bot) NotifyMessage(ctx context.Context, ev *slackevents.MessageEvent) error {
+	// Edits and deletions carry the timestamp of the event rather than of the
+	// original message; storing them would add bogus rows and module jobs.
+	switch ev.SubType {
+	case slack.MsgSubTypeMessageChanged, slack.MsgSubTypeMessageDeleted:
+		return nil
+	}
+
 	tx, err := b.DB.Begin(ctx)
 	if err != nil {
 		return err
@@ -190,7 +368,7 @@ func (b *Bot) NotifyMessage(ctx context.Context, ev *slackevents.MessageEvent) e
 	defer func() { _ = tx.Rollback(ctx) }()
 
 	if ev.ThreadTimeStamp == "" {
-		if err := b.AddMessage(ctx, tx, []schema.AddMessageParams{
+		if err := b.AddMessage(ctx, tx, []Message{
 			{
 				ChannelID: ev.Channel,
 				Ts:        ev.TimeStamp,
@@ -208,7 +386,7 @@ func (b *Bot) NotifyMessage(ctx context.Context, ev *slackevents.MessageEvent) e
 			return fmt.Errorf("adding message: %w", err)
 		}
 	} else {
-		if err := b.AddThreadMessages(ctx, tx, []schema.AddThreadMessageParams{
+		if err := b.AddThreadMessages(ctx, tx, []ThreadMessage{
 			{
 				ChannelID: ev.Channel,
 				ParentTs:  ev.ThreadTimeStamp,
@@ -232,12 +410,14 @@ func (b *Bot) NotifyMessage(ctx context.Context, ev *slackevents.MessageEvent) e
 }
 
 func (b *Bot) updateReaction(ctx context.Context, item slackevents.Item, reaction string, count int) error {
-	slog.DebugContext(ctx, "updating reaction", "item", item, "reaction", reaction, "count", count)
+	if slog.Default().Enabled(ctx, slog.LevelDebug) {
+		slog.DebugContext(ctx, "updating reaction", "item", item, "reaction", reaction, "count", count)
+	}
 	if item.Type != "message" {
 		return nil
 	}
 
-	if err := schema.New(b.DB).UpdateReaction(ctx, schema.UpdateReactionParams{
+	if err := b.queries.UpdateReaction(ctx, schema.UpdateReactionParams{
 		ChannelID: item.Channel,
 		Ts:        item.Timestamp,
 		Reaction:  reaction,
@@ -258,7 +438,7 @@ func (b *Bot) NotifyReactionAdded(ctx context.Context, ev *slackevents.ReactionA
 }
 
 func (b *Bot) GetChannel(ctx context.Context, channelID string) (schema.ChannelsV2, error) {
-	channel, err := schema.New(b.DB).GetChannel(ctx, channelID)
+	channel, err := b.queries.GetChannel(ctx, channelID)
 	if err != nil {
 		return schema.ChannelsV2{}, fmt.Errorf("getting channel %s: %w", channelID, err)
 	}
@@ -271,7 +451,7 @@ func (b *Bot) GetMessage(
 	channelID string,
 	slackTs string,
 ) (schema.GetMessageRow, error) {
-	msg, err := schema.New(b.DB).GetMessage(ctx, schema.GetMessageParams{
+	msg, err := b.queries.GetMessage(ctx, schema.GetMessageParams{
 		ChannelID: channelID,
 		Ts:        slackTs,
 	})
@@ -0,0 +1,70 @@
+package internal
+
+import (
+	"fmt"
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestChannelSet(t *testing.T) {
+	fill := func(s *channelSet) {
+		for i := range maxKnownChannels {
+			s.add(fmt.Sprintf("C%d", i))
+		}
+	}
+
+	tests := []struct {
+		name string
+		run  func(t *testing.T, s *channelSet, advance func(time.Duration))
+	}{
+		{
+			name: "contains added channels",
+			run: func(t *testing.T, s *channelSet, advance func(time.Duration)) {
+				require.False(t, s.contains("C1"))
+				s.add("C1")
+				require.True(t, s.contains("C1"))
+				require.False(t, s.contains("C2"))
+			},
+		},
+		{
+			name: "entries expire after the TTL",
+			run: func(t *testing.T, s *channelSet, advance func(time.Duration)) {
+				s.add("C1")
+				advance(knownChannelTTL - time.Second)
+				require.True(t, s.contains("C1"))
+				advance(time.Second)
+				require.False(t, s.contains("C1"))
+			},
+		},
+		{
+			name: "a full set does not grow",
+			run: func(t *testing.T, s *channelSet, advance func(time.Duration)) {
+				fill(s)
+				s.add("new")
+				require.False(t, s.contains("new"))
+				require.True(t, s.contains("C0"))
+				require.Len(t, s.expires, maxKnownChannels)
+			},
+		},
+		{
+			name: "a full set sweeps expired entries",
+			run: func(t *testing.T, s *channelSet, advance func(time.Duration)) {
+				fill(s)
+				advance(knownChannelTTL)
+				s.add("new")
+				require.True(t, s.contains("new"))
+				require.Len(t, s.expires, 1)
+			},
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			now := time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC)
+			s := &channelSet{now: func() time.Time { return now }}
+			tt.run(t, s, func(d time.Duration) { now = now.Add(d) })
+		})
+	}
+}
@@ -95,7 +95,7 @@ func (gs *gitHubSource) changesSince(ctx context.Context, revision string) (iter
 							return false
 						}
 					} else if content.GetType() == "file" {
-						slog.Info("GitHub API: file", "path", content.GetPath(), "blob_sha", content.GetSHA())
+						slog.Debug("GitHub API: file", "path", content.GetPath(), "blob_sha", content.GetSHA())
 
 						// Only process .md or .txt files
 						if ext := strings.ToLower(filepath.Ext(content.GetPath())); ext != ".md" && ext != ".txt" {
@@ -30,6 +30,11 @@ func ForToken(token string) (*github.Client, error) {
 	mu.Lock()
 	defer mu.Unlock()
 
+	// Another caller may have created the client while we waited.
+	if v, ok := cache.Load(k); ok {
+		return v.(*github.Client), nil
+	}
+
 	transport := &oauth2.Transport{
 		Base: http.DefaultTransport,
 		Source: oauth2.StaticTokenSource(
@@ -51,6 +56,11 @@ func ForApp(appID, installationID int64, privateKeyPath string) (*github.Client,
 	mu.Lock()
 	defer mu.Unlock()
 
+	// Another caller may have created the client while we waited.
+	if v, ok := cache.Load(k); ok {
+		return v.(*github.Client), nil
+	}
+
 	transport, err := ghinstallation.NewKeyFromFile(
 		http.DefaultTransport,
 		appID,
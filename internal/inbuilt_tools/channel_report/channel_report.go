@@ -124,8 +124,8 @@ When presenting this report, format it as a structured Slack message with the fo
 }
 
 func Generate(ctx context.Context, qtx *schema.Queries, channelID string, days int) (*ChannelReport, error) {
-	startTime := time.Now().AddDate(0, 0, -days)
 	endTime := time.Now()
+	startTime := endTime.AddDate(0, 0, -days)
 
 	messages, err := qtx.GetMessagesWithinTS(ctx, schema.GetMessagesWithinTSParams{
 		ChannelID: channelID,
@@ -139,45 +139,70 @@ func Generate(ctx context.Context, qtx *schema.Queries, channelID string, days i
 	incidentCounts := make(map[string]int)                // key: "service/alert"
 	incidentDurations := make(map[string][]time.Duration) // key: "service/alert"
 	triageMsgCounts := make(map[string]int)               // key: "service/alert"
+	// The triage lookup only depends on service/alert, so fetch it once per
+	// alert rather than once per firing.
+	threadMsgCounts := make(map[string]int) // key: "service/alert"
+	// Collect the human-written messages in the same pass so their latest
+	// thread replies can be loaded in one query instead of one per message.
+	parentTs := make([]string, 0, len(messages))
 
 	for _, msg := range messages {
-		incidentKey := fmt.Sprintf("%s/%s", msg.Attrs.IncidentAction.Service, msg.Attrs.IncidentAction.Alert)
+		if msg.Attrs.Message.BotID == "" {
+			parentTs = append(parentTs, msg.Ts)
+		}
+
+		incidentKey := msg.Attrs.IncidentAction.Service + "/" + msg.Attrs.IncidentAction.Alert
 
 		switch msg.Attrs.IncidentAction.Action {
 		case dto.ActionOpenIncident:
 			incidentCounts[incidentKey]++
 
-			msgs, err := qtx.GetThreadMessagesByServiceAndAlert(ctx, schema.GetThreadMessagesByServiceAndAlertParams{
-				Service: msg.Attrs.IncidentAction.Service,
-				Alert:   msg.Attrs.IncidentAction.Alert,
-			})
-			if err != nil {
-				return nil, fmt.Errorf("getting thread messages: %w", err)
+			count, ok := threadMsgCounts[incidentKey]
+			if !ok {
+				msgs, err := qtx.GetThreadMessagesByServiceAndAlert(ctx, schema.GetThreadMessagesByServiceAndAlertParams{
+					Service: msg.Attrs.IncidentAction.Service,
+					Alert:   msg.Attrs.IncidentAction.Alert,
+				})
+				if err != nil {
+					return nil, fmt.Errorf("getting thread messages: %w", err)
+				}
+
+				count = len(msgs)
+				threadMsgCounts[incidentKey] = count
 			}
 
-			triageMsgCounts[incidentKey] += len(msgs)
+			triageMsgCounts[incidentKey] += count
 		case dto.ActionCloseIncident:
 			incidentDurations[incidentKey] = append(incidentDurations[incidentKey], msg.Attrs.IncidentAction.Duration.Duration)
 		}
 	}
 
-	textMessages := make([][]string, 0, len(messages))
-	for _, msg := range messages {
-		if msg.Attrs.Message.BotID != "" {
+	threadMessages, err := qtx.GetThreadMessagesByParents(ctx, schema.GetThreadMessagesByParentsParams{
+		ChannelID: channelID,
+		ParentTs:  parentTs,
+		LimitVal:  10,
+	})
+	if err != nil {
+		return nil, fmt.Errorf("getting thread messages: %w", err)
+	}
+
+	threadMessagesByParent := make(map[string][]schema.GetThreadMessagesByParentsRow)
+	for _, threadMessage := range threadMessages {
+		if threadMessage.ParentTs == nil {
 			continue
 		}
 
-		threadMessages, err := qtx.GetThreadMessages(ctx, schema.GetThreadMessagesParams{
-			ChannelID: msg.ChannelID,
-			ParentTs:  msg.Ts,
-			LimitVal:  10,
-		})
-		if err != nil {
-			return nil, fmt.Errorf("getting thread messages: %w", err)
+		threadMessagesByParent[*threadMessage.ParentTs] = append(threadMessagesByParent[*threadMessage.ParentTs], threadMessage)
+	}
+
+	textMessages := make([][]string, 0, len(parentTs))
+	for _, msg := range messages {
+		if msg.Attrs.Message.BotID != "" {
+			continue
 		}
 
 		fullThreadMessages := []string{msg.Attrs.Message.Text}
-		for _, threadMessage := range threadMessages {
+		for _, threadMessage := range threadMessagesByParent[msg.Ts] {
 			if threadMessage.Attrs.Message.BotID != "" {
 				continue
 			}
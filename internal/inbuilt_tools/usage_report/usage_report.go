@@ -100,8 +100,8 @@ Use markdown formatting with headers, bullet points, and tables where appropriat
 }
 
 func Generate(ctx context.Context, db *schema.Queries, slackIntegration slack_integration.Integration, days int) (*UsageReport, error) {
-	startTs := time.Now().AddDate(0, 0, -days)
 	endTs := time.Now()
+	startTs := endTs.AddDate(0, 0, -days)
 
 	channelCount, err := db.CountChannels(ctx)
 	if err != nil {
@@ -132,14 +132,9 @@ func Generate(ctx context.Context, db *schema.Queries, slackIntegration slack_in
 
 		// Module usage
 		module := "unknown"
-		if msg.Attrs.Message.Text != "" {
-			// Look for module name in signature block
-			if strings.Contains(msg.Attrs.Message.Text, "[module:") {
-				parts := strings.Split(msg.Attrs.Message.Text, "[module:")
-				if len(parts) > 1 {
-					module = strings.Split(parts[1], "]")[0]
-				}
-			}
+		// Look for module name in signature block
+		if _, rest, ok := strings.Cut(msg.Attrs.Message.Text, "[module:"); ok {
+			module, _, _ = strings.Cut(rest, "]")
 		}
 
 		if _, exists := moduleUsage[module]; !exists {
@@ -24,6 +24,7 @@ import (
 	"github.com/openai/openai-go/shared"
 	"github.com/qri-io/jsonschema"
 	"go.opentelemetry.io/otel"
+	"golang.org/x/sync/errgroup"
 
 	"github.com/dynoinc/ratchet/internal/storage/schema"
 	"github.com/dynoinc/ratchet/internal/storage/schema/dto"
@@ -66,6 +67,7 @@ func persistLLMUsageMiddleware(db *pgxpool.Pool) option.Middleware {
 		})
 	}
 
+	queries := schema.New(db)
 	return func(req *http.Request, next option.MiddlewareNext) (*http.Response, error) {
 		var input dto.LLMInput
 		var model string
@@ -109,7 +111,7 @@ func persistLLMUsageMiddleware(db *pgxpool.Pool) option.Middleware {
 			Model:  model,
 		}
 
-		if _, persistErr := schema.New(db).AddLLMUsage(req.Context(), params); persistErr != nil {
+		if persistErr := queries.AddLLMUsage(req.Context(), params); persistErr != nil {
 			slog.WarnContext(req.Context(), "failed to persist LLM usage", "error", persistErr)
 		}
 
@@ -239,21 +241,30 @@ func New(ctx context.Context, cfg Config, db *pgxpool.Pool) (Client, error) {
 		return nil, nil
 	}
 
+	// Completions and embeddings are requested from many workers at once;
+	// keep enough idle connections to the endpoint for them to be reused
+	// instead of re-dialing TLS for each request.
+	transport := http.DefaultTransport.(*http.Transport).Clone()
+	transport.MaxIdleConnsPerHost = 32
+
 	openaiClient := openai.NewClient(
 		option.WithBaseURL(cfg.URL),
 		option.WithAPIKey(cfg.APIKey),
+		option.WithHTTPClient(&http.Client{Transport: transport}),
 		option.WithMiddleware(persistLLMUsageMiddleware(db)),
 		// This MUST be last, otherwise it will measure other middleware
 		option.WithMiddleware(NewOtelMiddleware(otel.GetTracerProvider(), OtelMiddlewareConfig{AddEventDetails: true})),
 	)
 
-	// Check and download the main model if needed
-	if err := checkAndDownloadModel(ctx, openaiClient, cfg.Model, cfg.URL); err != nil {
-		return nil, err
+	// Check and download the main and embedding models if needed. The checks
+	// are independent, so run them concurrently to cut startup latency.
+	g, gctx := errgroup.WithContext(ctx)
+	for _, model := range []string{cfg.Model, cfg.EmbeddingModel} {
+		g.Go(func() error {
+			return checkAndDownloadModel(gctx, openaiClient, model, cfg.URL)
+		})
 	}
-
-	// Check and download the embedding model if needed
-	if err := checkAndDownloadModel(ctx, openaiClient, cfg.EmbeddingModel, cfg.URL); err != nil {
+	if err := g.Wait(); err != nil {
 		return nil, err
 	}
 
@@ -8,6 +8,7 @@ import (
 	"log/slog"
 	"os"
 	"os/exec"
+	"sync"
 	"text/template"
 	"time"
 
@@ -65,11 +66,84 @@ type channelMessage struct {
 	SlackTimestamp string `json:"slack_ts"`
 }
 
+type slugEntry struct {
+	slug  string
+	entry *entry
+}
+
 type channelMonitor struct {
 	bot              *internal.Bot
 	slackIntegration slack_integration.Integration
 	llmClient        llm.Client
 	cfg              config
+
+	// byChannel indexes the entries of cfg by channel ID. It is built on
+	// first use so that it always reflects cfg.
+	byChannelOnce sync.Once
+	byChannel     map[string][]slugEntry
+
+	// userIDs caches the Slack user ID looked up for each direct message
+	// recipient's email.
+	userIDs userIDCache
+}
+
+const (
+	userIDTTL  = time.Hour
+	maxUserIDs = 1024
+)
+
+type cachedUserID struct {
+	userID  string
+	expires time.Time
+}
+
+// userIDCache is a bounded map from email to Slack user ID whose entries
+// expire after userIDTTL.
+type userIDCache struct {
+	mu      sync.Mutex
+	entries map[string]cachedUserID
+	// now returns the current time; nil means time.Now. Tests override it.
+	now func() time.Time
+}
+
+func (u *userIDCache) currentTime() time.Time {
+	if u.now != nil {
+		return u.now()
+	}
+	return time.Now()
+}
+
+func (u *userIDCache) get(email string) (string, bool) {
+	u.mu.Lock()
+	defer u.mu.Unlock()
+
+	cached, ok := u.entries[email]
+	if !ok || !u.currentTime().Before(cached.expires) {
+		return "", false
+	}
+	return cached.userID, true
+}
+
+func (u *userIDCache) add(email, userID string) {
+	u.mu.Lock()
+	defer u.mu.Unlock()
+
+	now := u.currentTime()
+	if u.entries == nil {
+		u.entries = make(map[string]cachedUserID)
+	}
+	if _, ok := u.entries[email]; !ok && len(u.entries) >= maxUserIDs {
+		for e, cached := range u.entries {
+			if !now.Before(cached.expires) {
+				delete(u.entries, e)
+			}
+		}
+		if len(u.entries) >= maxUserIDs {
+			return
+		}
+	}
+
+	u.entries[email] = cachedUserID{userID: userID, expires: now.Add(userIDTTL)}
 }
 
 func (c *channelMonitor) Name() string {
@@ -141,18 +215,26 @@ func (c *channelMonitor) OnMessage(ctx context.Context, channelID string, slackT
 	if msg.Message.SubType != "" {
 		return nil
 	}
-	for slug, entry := range c.cfg {
-		if entry.ChannelID != channelID {
-			continue
-		}
-		slog.Debug("found matching channel", "channel_id", entry.ChannelID, "slug", slug)
-		if err := c.handleMessage(ctx, slug, entry, slackTS, msg); err != nil {
+	for _, e := range c.entriesForChannel(channelID) {
+		slog.Debug("found matching channel", "channel_id", e.entry.ChannelID, "slug", e.slug)
+		if err := c.handleMessage(ctx, e.slug, e.entry, slackTS, msg); err != nil {
 			return fmt.Errorf("handling message in channel %s: %w", channelID, err)
 		}
 	}
 	return nil
 }
 
+func (c *channelMonitor) entriesForChannel(channelID string) []slugEntry {
+	c.byChannelOnce.Do(func() {
+		c.byChannel = make(map[string][]slugEntry, len(c.cfg))
+		for slug, entry := range c.cfg {
+			c.byChannel[entry.ChannelID] = append(c.byChannel[entry.ChannelID], slugEntry{slug: slug, entry: entry})
+		}
+	})
+
+	return c.byChannel[channelID]
+}
+
 func (c *channelMonitor) handleMessage(ctx context.Context, slug string, entry *entry, slackTS string, msg dto.MessageAttrs) error {
 	data := promptData{msg.Message}
 	var prompt bytes.Buffer
@@ -203,20 +285,35 @@ func (c *channelMonitor) runExecutable(ctx context.Context, slug string, entry *
 	cmd.Stdin = bytes.NewReader(stdInDataBytes)
 
 	if err := cmd.Run(); err != nil {
-		slog.Error("command execution failed", "error", err)
-		slog.Error("stderr:")
-		slog.Error(stderrBuffer.String())
-		slog.Error("stdout:")
-		slog.Error(stdoutBuffer.String())
+		slog.ErrorContext(ctx, "command execution failed",
+			"slug", slug,
+			"error", err,
+			"stderr", stderrBuffer.String(),
+			"stdout", stdoutBuffer.String(),
+		)
 		return "", fmt.Errorf("command execution failed: %w", err)
 	}
 	output := stdoutBuffer.String()
 	return output, nil
 }
 
+func (c *channelMonitor) getUserIDByEmail(ctx context.Context, email string) (string, error) {
+	if userID, ok := c.userIDs.get(email); ok {
+		return userID, nil
+	}
+
+	userID, err := c.slackIntegration.GetUserIDByEmail(ctx, email)
+	if err != nil {
+		return "", err
+	}
+
+	c.userIDs.add(email, userID)
+	return userID, nil
+}
+
 func (c *channelMonitor) doOutputActions(ctx context.Context, outputData executableStdOutData) error {
 	for _, dm := range outputData.DirectMessages {
-		userID, err := c.slackIntegration.GetUserIDByEmail(ctx, dm.Email)
+		userID, err := c.getUserIDByEmail(ctx, dm.Email)
 		if err != nil {
 			slog.Warn("getting user ID by email", "error", err)
 			continue
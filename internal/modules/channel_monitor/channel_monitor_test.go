@@ -3,6 +3,7 @@ package channel_monitor
 import (
 	"bytes"
 	"context"
+	"fmt"
 	"strings"
 	"testing"
 	"text/template"
@@ -174,6 +175,46 @@ func TestHandleMessage(t *testing.T) {
 	assert.NoError(t, err)
 }
 
+func TestGetUserIDByEmail(t *testing.T) {
+	mockCtl := gomock.NewController(t)
+	defer mockCtl.Finish()
+	ctx := t.Context()
+
+	mockSlack := slackmocks.NewMockIntegration(mockCtl)
+	now := time.Date(2025, 1, 1, 0, 0, 0, 0, time.UTC)
+	cm := &channelMonitor{slackIntegration: mockSlack}
+	cm.userIDs.now = func() time.Time { return now }
+
+	// Looked up once, then served from the cache until it expires.
+	mockSlack.EXPECT().GetUserIDByEmail(ctx, "user@example.com").Return("U123", nil).Times(2)
+	for range 2 {
+		userID, err := cm.getUserIDByEmail(ctx, "user@example.com")
+		require.NoError(t, err)
+		assert.Equal(t, "U123", userID)
+	}
+
+	now = now.Add(userIDTTL)
+	userID, err := cm.getUserIDByEmail(ctx, "user@example.com")
+	require.NoError(t, err)
+	assert.Equal(t, "U123", userID)
+
+	// A full cache does not grow, but makes room once entries expire.
+	for i := range maxUserIDs {
+		cm.userIDs.add(fmt.Sprintf("user%d@example.com", i), "U1")
+	}
+	cm.userIDs.add("new@example.com", "U2")
+	_, ok := cm.userIDs.get("new@example.com")
+	assert.False(t, ok)
+	assert.Len(t, cm.userIDs.entries, maxUserIDs)
+
+	now = now.Add(userIDTTL)
+	cm.userIDs.add("new@example.com", "U2")
+	userID, ok = cm.userIDs.get("new@example.com")
+	assert.True(t, ok)
+	assert.Equal(t, "U2", userID)
+	assert.Len(t, cm.userIDs.entries, 1)
+}
+
 func TestRunExecutable(t *testing.T) {
 	tests := []struct {
 		name           string
@@ -68,7 +68,11 @@ func (w *classifier) OnMessage(ctx context.Context, channelID string, slackTS st
 		params.Attrs = dto.MessageAttrs{IncidentAction: action}
 	}
 
-	slog.DebugContext(ctx, "classified message", "channel_id", params.ChannelID, "slack_ts", params.Ts, "text", msg.Message.Text, "attrs", params.Attrs)
+	// Boxing the message text and attrs allocates on every message, so only
+	// build the record when debug logging is actually on.
+	if slog.Default().Enabled(ctx, slog.LevelDebug) {
+		slog.DebugContext(ctx, "classified message", "channel_id", params.ChannelID, "slack_ts", params.Ts, "text", msg.Message.Text, "attrs", params.Attrs)
+	}
 
 	if err := schema.New(w.bot.DB).UpdateMessageAttrs(ctx, params); err != nil {
 		return fmt.Errorf("updating message %s (ts=%s): %w", params.ChannelID, params.Ts, err)
@@ -8,6 +8,7 @@ import (
 	"os"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/mark3labs/mcp-go/client"
@@ -19,6 +20,7 @@ import (
 	"go.opentelemetry.io/otel/codes"
 	semconv "go.opentelemetry.io/otel/semconv/v1.22.0"
 	"go.opentelemetry.io/otel/trace"
+	"golang.org/x/sync/errgroup"
 
 	"github.com/dynoinc/ratchet/internal"
 	"github.com/dynoinc/ratchet/internal/docs"
@@ -41,6 +43,13 @@ type Commands struct {
 	llmClient        llm.Client
 	tracer           trace.Tracer
 	mcpClients       []*client.Client
+
+	botUserID string
+	// mentionPrefix is the "<@botID> " prefix of messages addressed to the bot.
+	mentionPrefix string
+	// mcpInstructions holds the "instructions" prompts of the MCP servers
+	// that advertise prompts.
+	mcpInstructions []*mcpInstructions
 }
 
 func New(
@@ -52,8 +61,9 @@ func New(
 	docsConfig *docs.Config,
 ) (*Commands, error) {
 	var mcpClients []*client.Client
+	var instructions []*mcpInstructions
 
-	// Inbuilt tools
+	// Inbuilt tools (these serve no prompts)
 	inbuilt, err := inbuilt_tools.Client(ctx, schema.New(bot.DB), llmClient, slackIntegration, docsConfig)
 	if err != nil {
 		return nil, fmt.Errorf("creating inbuilt tools client: %w", err)
@@ -67,15 +77,24 @@ func New(
 			return nil, fmt.Errorf("creating MCP client: %w", err)
 		}
 
-		_, err = mc.Initialize(ctx, mcp.InitializeRequest{})
+		res, err := mc.Initialize(ctx, mcp.InitializeRequest{})
 		if err != nil {
 			return nil, fmt.Errorf("initializing MCP client: %w", err)
 		}
 
 		slog.DebugContext(ctx, "created MCP client", "url", url)
 		mcpClients = append(mcpClients, mc)
+		if res.Capabilities.Prompts != nil {
+			instructions = append(instructions, &mcpInstructions{url: url, client: mc})
+		}
 	}
 
+	// Fetch the instructions up front; servers that fail are retried later.
+	for _, in := range instructions {
+		in.get(ctx)
+	}
+
+	botUserID := slackIntegration.BotUserID()
 	return &Commands{
 		config:           config,
 		bot:              bot,
@@ -83,6 +102,9 @@ func New(
 		llmClient:        llmClient,
 		mcpClients:       mcpClients,
 		tracer:           otel.Tracer("ratchet.commands"),
+		botUserID:        botUserID,
+		mentionPrefix:    "<@" + botUserID + "> ",
+		mcpInstructions:  instructions,
 	}, nil
 }
 
@@ -140,8 +162,7 @@ func (c *Commands) OnThreadMessage(ctx context.Context, channelID string, slackT
 func (c *Commands) Generate(ctx context.Context, channelID string, slackTS string, msg dto.MessageAttrs) (string, error) {
 	ctx, span := c.startSlackSpan(ctx, "commands.generate", channelID, msg.Message.User, slackTS)
 	defer span.End()
-	botID := c.slackIntegration.BotUserID()
-	if !strings.HasPrefix(msg.Message.Text, fmt.Sprintf("<@%s> ", botID)) {
+	if !strings.HasPrefix(msg.Message.Text, c.mentionPrefix) {
 		return "", nil
 	}
 
@@ -156,13 +177,30 @@ func (c *Commands) Generate(ctx context.Context, channelID string, slackTS strin
 		slog.WarnContext(ctx, "failed to get thread messages for context", "error", err)
 	}
 
+	// List tools from every MCP server concurrently; each may be a separate
+	// process, so listing them one after another adds up per message.
+	toolLists := make([]*mcp.ListToolsResult, len(c.mcpClients))
+	var g errgroup.Group
+	for i, mcpClient := range c.mcpClients {
+		g.Go(func() error {
+			tools, err := mcpClient.ListTools(ctx, mcp.ListToolsRequest{})
+			if err != nil {
+				slog.WarnContext(ctx, "listing tools", "error", err)
+				return nil
+			}
+
+			toolLists[i] = tools
+			return nil
+		})
+	}
+	_ = g.Wait()
+
 	var openAITools []openai.ChatCompletionToolParam
 	toolToClient := make(map[string]*client.Client)
 	toolByName := make(map[string]mcp.Tool)
-	for _, mcpClient := range c.mcpClients {
-		tools, err := mcpClient.ListTools(ctx, mcp.ListToolsRequest{})
-		if err != nil {
-			slog.WarnContext(ctx, "listing tools", "error", err)
+	for i, mcpClient := range c.mcpClients {
+		tools := toolLists[i]
+		if tools == nil {
 			continue
 		}
 
@@ -205,21 +243,21 @@ func (c *Commands) Generate(ctx context.Context, channelID string, slackTS strin
 	conversationHistory = append(conversationHistory, openai.SystemMessage(systemPrompt))
 
 	// Add the top message
-	topMsgText := strings.TrimPrefix(topMsg.Attrs.Message.Text, fmt.Sprintf("<@%s> ", botID))
+	topMsgText := strings.TrimPrefix(topMsg.Attrs.Message.Text, c.mentionPrefix)
 	timestamp := slackTsToRFC3339(ctx, topMsg.Ts)
 	msgWithTimestamp := fmt.Sprintf("[%s] %s", timestamp, topMsgText)
 	conversationHistory = append(conversationHistory, openai.UserMessage(msgWithTimestamp))
 
 	// Add thread history
 	for _, threadMsg := range threadMessages {
-		if threadMsg.Attrs.Message.User == c.slackIntegration.BotUserID() {
+		if threadMsg.Attrs.Message.User == c.botUserID {
 			// Assistant message
 			timestamp := slackTsToRFC3339(ctx, threadMsg.Ts)
 			msgWithTimestamp := fmt.Sprintf("[%s] %s", timestamp, threadMsg.Attrs.Message.Text)
 			conversationHistory = append(conversationHistory, openai.AssistantMessage(msgWithTimestamp))
 		} else {
 			// User message
-			threadMsgText := strings.TrimPrefix(threadMsg.Attrs.Message.Text, fmt.Sprintf("<@%s> ", c.slackIntegration.BotUserID()))
+			threadMsgText := strings.TrimPrefix(threadMsg.Attrs.Message.Text, c.mentionPrefix)
 			timestamp := slackTsToRFC3339(ctx, threadMsg.Ts)
 			msgWithTimestamp := fmt.Sprintf("[%s] %s", timestamp, threadMsgText)
 			conversationHistory = append(conversationHistory, openai.UserMessage(msgWithTimestamp))
@@ -366,19 +404,19 @@ func (c *Commands) callTool(ctx context.Context, client *client.Client, tool mcp
 // slackTsToRFC3339 converts a Slack timestamp to RFC3339 format or returns original if conversion fails
 func slackTsToRFC3339(ctx context.Context, slackTs string) string {
 	// Parse Slack timestamp (format: "1355517523.000005")
-	parts := strings.Split(slackTs, ".")
-	if len(parts) != 2 {
+	secondsStr, microsecondsStr, ok := strings.Cut(slackTs, ".")
+	if !ok || strings.Contains(microsecondsStr, ".") {
 		slog.WarnContext(ctx, "unable to parse slack timestamp: invalid format", "ts", slackTs)
 		return slackTs
 	}
 
-	seconds, err := strconv.ParseInt(parts[0], 10, 64)
+	seconds, err := strconv.ParseInt(secondsStr, 10, 64)
 	if err != nil {
 		slog.WarnContext(ctx, "unable to parse slack timestamp: invalid seconds", "ts", slackTs, "error", err)
 		return slackTs
 	}
 
-	microseconds, err := strconv.ParseInt(parts[1], 10, 64)
+	microseconds, err := strconv.ParseInt(microsecondsStr, 10, 64)
 	if err != nil {
 		slog.WarnContext(ctx, "unable to parse slack timestamp: invalid microseconds", "ts", slackTs, "error", err)
 		return slackTs
@@ -388,6 +426,53 @@ func slackTsToRFC3339(ctx context.Context, slackTs string) string {
 	return t.UTC().Format(time.RFC3339)
 }
 
+// mcpInstructionsRetryInterval is how long to wait before fetching an MCP
+// server's instructions prompt again after a failure.
+const mcpInstructionsRetryInterval = time.Minute
+
+// mcpInstructions is the "instructions" prompt of an MCP server. The prompt
+// is static, so it is fetched once and reused; failed fetches are retried.
+type mcpInstructions struct {
+	url    string
+	client *client.Client
+
+	mu        sync.Mutex
+	fetched   bool
+	text      string
+	nextRetry time.Time
+}
+
+func (m *mcpInstructions) get(ctx context.Context) string {
+	m.mu.Lock()
+	defer m.mu.Unlock()
+
+	if m.fetched || time.Now().Before(m.nextRetry) {
+		return m.text
+	}
+
+	promptResult, err := m.client.GetPrompt(ctx, mcp.GetPromptRequest{
+		Params: mcp.GetPromptParams{
+			Name: "instructions",
+		},
+	})
+	if err != nil {
+		slog.WarnContext(ctx, "getting MCP instructions prompt", "url", m.url, "error", err)
+		m.nextRetry = time.Now().Add(mcpInstructionsRetryInterval)
+		return ""
+	}
+
+	var text strings.Builder
+	for _, msg := range promptResult.Messages {
+		if textContent, ok := mcp.AsTextContent(msg.Content); ok {
+			text.WriteString("\n\n---\n\n")
+			text.WriteString(textContent.Text)
+		}
+	}
+
+	m.text, m.fetched = text.String(), true
+	return m.text
+}
+
 // GetSystemPrompt builds the complete system prompt with context and MCP instructions
 func (c *Commands) GetSystemPrompt(ctx context.Context, channelID string, incidentAction dto.IncidentAction) string {
 	systemPrompt := fmt.Sprintf(`You are a helpful assistant that manages Slack channels and provides various utilities.
@@ -435,21 +520,8 @@ When a user requests documentation updates, follow this 2-step process:
 Always explain what you're doing at each step and get user approval before proceeding to step 2.`
 
 	// Add MCP server instructions if available
-	for _, mcpClient := range c.mcpClients {
-		// Try to get the "instructions" prompt and skip silently if not found
-		promptResult, err := mcpClient.GetPrompt(ctx, mcp.GetPromptRequest{
-			Params: mcp.GetPromptParams{
-				Name: "instructions",
-			},
-		})
-		if err != nil {
-			continue
-		}
-		for _, msg := range promptResult.Messages {
-			if textContent, ok := mcp.AsTextContent(msg.Content); ok {
-				systemPrompt += "\n\n---\n\n" + textContent.Text
-			}
-		}
+	for _, instructions := range c.mcpInstructions {
+		systemPrompt += instructions.get(ctx)
 	}
 	systemPrompt += `
 
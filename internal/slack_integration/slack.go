@@ -4,9 +4,11 @@ package slack_integration
 
 import (
 	"context"
+	"errors"
 	"fmt"
 	"log/slog"
 	"net/http"
+	"sync"
 	"time"
 
 	"github.com/slack-go/slack"
@@ -72,7 +74,12 @@ type integration struct {
 }
 
 func New(ctx context.Context, c Config, h handler) (Integration, error) {
-	transport := otelhttp.NewTransport(http.DefaultTransport, otelhttp.WithFilter(filterRootSpans), otelhttp.WithSpanNameFormatter(spanNameFormatter))
+	// All Slack API calls go to the same host, so keep enough idle connections
+	// around for the concurrent workers to reuse instead of re-dialing TLS.
+	base := http.DefaultTransport.(*http.Transport).Clone()
+	base.MaxIdleConnsPerHost = 32
+
+	transport := otelhttp.NewTransport(base, otelhttp.WithFilter(filterRootSpans), otelhttp.WithSpanNameFormatter(spanNameFormatter))
 	client := &http.Client{Transport: transport}
 	api := slack.New(c.BotToken, slack.OptionAppLevelToken(c.AppToken), slack.OptionHTTPClient(client))
 
@@ -92,7 +99,43 @@ func New(ctx context.Context, c Config, h handler) (Integration, error) {
 }
 
 func (b *integration) Run(ctx context.Context) error {
+	// Events are handled on their own goroutine, in the order they were
+	// received, so that slow database work does not hold up reading and
+	// acknowledging the events behind them.
+	events := make(chan slackevents.EventsAPIEvent, eventBufferSize)
+
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+
+	// Events are acked before they are handled, so Slack will not redeliver
+	// them. On shutdown keep handling the buffered ones on a context that
+	// outlives ctx, for at most eventDrainTimeout.
+	handleCtx, cancelHandle := context.WithCancel(context.WithoutCancel(ctx))
+	defer cancelHandle()
+	stopDrainTimer := context.AfterFunc(ctx, func() {
+		time.AfterFunc(eventDrainTimeout, cancelHandle)
+	})
+	defer stopDrainTimer()
+
+	var wg sync.WaitGroup
+	wg.Add(2)
 	go func() {
+		defer wg.Done()
+		for eventsAPI := range events {
+			if handleCtx.Err() != nil {
+				slog.WarnContext(ctx, "dropping unhandled events", "count", len(events)+1)
+				return
+			}
+
+			if err := b.handleEventAPI(handleCtx, eventsAPI); err != nil {
+				slog.ErrorContext(handleCtx, "handling event", "error", err)
+			}
+		}
+	}()
+
+	go func() {
+		defer wg.Done()
+		defer close(events)
 		for {
 			select {
 			case <-ctx.Done():
@@ -105,22 +148,31 @@ func (b *integration) Run(ctx context.Context) error {
 						continue
 					}
 
-					if err := b.handleEventAPI(ctx, eventsAPI); err != nil {
-						slog.ErrorContext(ctx, "handling event", "error", err)
-					}
-
+					// Ack before handling so that slow database work does not
+					// hold up the envelope and trigger redelivery by Slack.
 					if err := b.client.AckCtx(ctx, evt.Request.EnvelopeID, nil); err != nil {
 						slog.ErrorContext(ctx, "acknowledging event",
 							"error", err,
 							"envelope_id", evt.Request.EnvelopeID,
 						)
 					}
+
+					// The event is acked, so hand it over even if ctx is
+					// cancelled; only give up once draining has stopped.
+					select {
+					case events <- eventsAPI:
+					case <-handleCtx.Done():
+						return
+					}
 				}
 			}
 		}
 	}()
 
-	return b.client.RunContext(ctx)
+	err := b.client.RunContext(ctx)
+	cancel()
+	wg.Wait()
+	return err
 }
 
 func (b *integration) handleEventAPI(ctx context.Context, event slackevents.EventsAPIEvent) error {
@@ -154,20 +206,35 @@ func (b *integration) Client() *slack.Client {
 }
 
 func (b *integration) GetConversationInfo(ctx context.Context, channelID string) (*slack.Channel, error) {
-	return b.client.GetConversationInfoContext(ctx, &slack.GetConversationInfoInput{
-		ChannelID: channelID,
+	var channel *slack.Channel
+	err := retryRateLimited(ctx, func() error {
+		var err error
+		channel, err = b.client.GetConversationInfoContext(ctx, &slack.GetConversationInfoInput{
+			ChannelID: channelID,
+		})
+		return err
 	})
+	return channel, err
 }
 
 func (b *integration) GetConversationHistory(ctx context.Context, channelID string, lastNMsgs int) ([]slack.Message, error) {
+	if lastNMsgs <= 0 {
+		return nil, fmt.Errorf("getting conversation history for channel ID %s: invalid message count %d", channelID, lastNMsgs)
+	}
+
 	params := &slack.GetConversationHistoryParameters{
 		ChannelID: channelID,
 		Latest:    timeToTs(time.Now()),
-		Limit:     lastNMsgs,
+		Limit:     min(lastNMsgs, pageSize),
 	}
 	var messages []slack.Message
 	for {
-		history, err := b.client.GetConversationHistoryContext(ctx, params)
+		var history *slack.GetConversationHistoryResponse
+		err := retryRateLimited(ctx, func() error {
+			var err error
+			history, err = b.client.GetConversationHistoryContext(ctx, params)
+			return err
+		})
 		if err != nil {
 			return nil, fmt.Errorf("getting conversation history for channel ID %s: %w", channelID, err)
 		}
@@ -177,10 +244,16 @@ func (b *integration) GetConversationHistory(ctx context.Context, channelID stri
 			break
 		}
 
+		// Only ask for as many messages as are still needed.
+		params.Limit = min(lastNMsgs-len(messages), pageSize)
 		params.Cursor = history.ResponseMetadata.Cursor
 		params.Latest = history.Messages[len(history.Messages)-1].Timestamp
 	}
 
+	if len(messages) > lastNMsgs {
+		messages = messages[:lastNMsgs]
+	}
+
 	return messages, nil
 }
 
@@ -188,11 +261,21 @@ func (b *integration) GetConversationReplies(ctx context.Context, channelID, ts
 	params := &slack.GetConversationRepliesParameters{
 		ChannelID: channelID,
 		Timestamp: ts,
+		Limit:     pageSize,
 	}
 
 	var messages []slack.Message
 	for {
-		threadMessages, hasMore, nextCursor, err := b.client.GetConversationRepliesContext(ctx, params)
+		var (
+			threadMessages []slack.Message
+			hasMore        bool
+			nextCursor     string
+		)
+		err := retryRateLimited(ctx, func() error {
+			var err error
+			threadMessages, hasMore, nextCursor, err = b.client.GetConversationRepliesContext(ctx, params)
+			return err
+		})
 		if err != nil {
 			return nil, fmt.Errorf("getting conversation replies for channel ID %s: %w", channelID, err)
 		}
@@ -213,11 +296,20 @@ func (b *integration) GetBotChannels() ([]slack.Channel, error) {
 		UserID:          b.botUserID,
 		Types:           []string{"public_channel"},
 		ExcludeArchived: true,
+		Limit:           pageSize,
 	}
 
 	var channels []slack.Channel
 	for {
-		response, nextCursor, err := b.client.GetConversationsForUserContext(context.Background(), params)
+		var (
+			response   []slack.Channel
+			nextCursor string
+		)
+		err := retryRateLimited(context.Background(), func() error {
+			var err error
+			response, nextCursor, err = b.client.GetConversationsForUserContext(context.Background(), params)
+			return err
+		})
 		if err != nil {
 			return nil, err
 		}
@@ -239,11 +331,14 @@ func (b *integration) PostMessage(ctx context.Context, channelID string, message
 		channelID = b.c.DevChannel
 	}
 
-	_, _, err := b.client.PostMessageContext(
-		ctx,
-		channelID,
-		slack.MsgOptionBlocks(messageBlocks...),
-	)
+	err := retryRateLimited(ctx, func() error {
+		_, _, err := b.client.PostMessageContext(
+			ctx,
+			channelID,
+			slack.MsgOptionBlocks(messageBlocks...),
+		)
+		return err
+	})
 	if err != nil {
 		return fmt.Errorf("posting report message: %w", err)
 	}
@@ -259,10 +354,13 @@ func (b *integration) PostThreadReply(ctx context.Context, channelID, ts string,
 		msgOptions = append(msgOptions, slack.MsgOptionTS(ts))
 	}
 
-	if _, _, err := b.client.PostMessageContext(
-		ctx,
-		channelID,
-		msgOptions...); err != nil {
+	if err := retryRateLimited(ctx, func() error {
+		_, _, err := b.client.PostMessageContext(
+			ctx,
+			channelID,
+			msgOptions...)
+		return err
+	}); err != nil {
 		return fmt.Errorf("posting thread reply: %w", err)
 	}
 
@@ -274,13 +372,54 @@ func (b *integration) BotUserID() string {
 }
 
 func (b *integration) GetUserIDByEmail(ctx context.Context, email string) (string, error) {
-	user, err := b.client.GetUserByEmailContext(ctx, email)
+	var user *slack.User
+	err := retryRateLimited(ctx, func() error {
+		var err error
+		user, err = b.client.GetUserByEmailContext(ctx, email)
+		return err
+	})
 	if err != nil {
 		return "", fmt.Errorf("getting user by email %s: %w", email, err)
 	}
 	return user.ID, nil
 }
 
+// eventBufferSize is the number of acknowledged events that may be waiting
+// to be handled before reading further events blocks.
+const eventBufferSize = 1000
+
+// eventDrainTimeout bounds how long buffered events are still handled after
+// Run's context is cancelled.
+const eventDrainTimeout = 30 * time.Second
+
+// pageSize is the number of items requested per page from Slack's cursor
+// paginated endpoints. Slack recommends no more than 200.
+const pageSize = 200
+
+// maxRateLimitAttempts bounds how many times a single call is attempted
+// while Slack keeps responding with HTTP 429.
+const maxRateLimitAttempts = 5
+
+// retryRateLimited runs fn and, when Slack rate limits it, waits for the
+// Retry-After interval Slack asked for before trying again.
+func retryRateLimited(ctx context.Context, fn func() error) error {
+	for attempt := 1; ; attempt++ {
+		err := fn()
+
+		var rateLimitErr *slack.RateLimitedError
+		if !errors.As(err, &rateLimitErr) || attempt >= maxRateLimitAttempts {
+			return err
+		}
+
+		slog.WarnContext(ctx, "rate limited by slack", "retry_after", rateLimitErr.RetryAfter, "attempt", attempt)
+		select {
+		case <-ctx.Done():
+			return ctx.Err()
+		case <-time.After(rateLimitErr.RetryAfter):
+		}
+	}
+}
+
 func timeToTs(t time.Time) string {
 	// Convert time.Time to Unix seconds and nanoseconds
 	seconds := t.Unix()
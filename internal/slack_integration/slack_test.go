@@ -0,0 +1,88 @@
+package slack_integration
+
+import (
+	"context"
+	"errors"
+	"testing"
+	"time"
+
+	"github.com/slack-go/slack"
+	"github.com/stretchr/testify/require"
+)
+
+func TestRetryRateLimited(t *testing.T) {
+	errOther := errors.New("channel_not_found")
+
+	tests := []struct {
+		name        string
+		retryAfter  time.Duration
+		rateLimited int // number of calls that are rate limited before fn succeeds
+		fnErr       error
+		cancel      bool
+		wantCalls   int
+		wantErr     func(t *testing.T, err error)
+	}{
+		{
+			name:      "success",
+			wantCalls: 1,
+		},
+		{
+			name:      "other errors are not retried",
+			fnErr:     errOther,
+			wantCalls: 1,
+			wantErr: func(t *testing.T, err error) {
+				require.ErrorIs(t, err, errOther)
+			},
+		},
+		{
+			name:        "succeeds after rate limiting",
+			rateLimited: 2,
+			wantCalls:   3,
+		},
+		{
+			name:        "gives up after max attempts",
+			rateLimited: maxRateLimitAttempts + 1,
+			wantCalls:   maxRateLimitAttempts,
+			wantErr: func(t *testing.T, err error) {
+				var rateLimitErr *slack.RateLimitedError
+				require.ErrorAs(t, err, &rateLimitErr)
+			},
+		},
+		{
+			name:        "stops waiting when the context is cancelled",
+			retryAfter:  time.Hour,
+			rateLimited: 1,
+			cancel:      true,
+			wantCalls:   1,
+			wantErr: func(t *testing.T, err error) {
+				require.ErrorIs(t, err, context.Canceled)
+			},
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			ctx, cancel := context.WithCancel(t.Context())
+			defer cancel()
+
+			calls := 0
+			err := retryRateLimited(ctx, func() error {
+				calls++
+				if calls <= tt.rateLimited {
+					if tt.cancel {
+						cancel()
+					}
+					return &slack.RateLimitedError{RetryAfter: tt.retryAfter}
+				}
+				return tt.fnErr
+			})
+
+			require.Equal(t, tt.wantCalls, calls)
+			if tt.wantErr == nil {
+				require.NoError(t, err)
+			} else {
+				tt.wantErr(t, err)
+			}
+		})
+	}
+}
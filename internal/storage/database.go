@@ -2,7 +2,6 @@ package storage
 
 import (
 	"context"
-	"database/sql"
 	"embed"
 	"errors"
 	"fmt"
@@ -12,11 +11,11 @@ import (
 	"net/url"
 	"strconv"
 	"strings"
+	"time"
 
 	"github.com/amirsalarsafaei/sqlc-pgx-monitoring/dbtracer"
 	"github.com/jackc/pgx/v5"
 	"github.com/jackc/pgx/v5/pgxpool"
-	_ "github.com/lib/pq"
 	pgxvector "github.com/pgvector/pgvector-go/pgx"
 	"github.com/riverqueue/river/riverdriver/riverpgxv5"
 	"github.com/riverqueue/river/rivermigrate"
@@ -33,6 +32,18 @@ type DatabaseConfig struct {
 	Pass       string `split_words:"true" default:"password"`
 	Name       string `split_words:"true" default:"ratchet"`
 	DisableTLS bool   `split_words:"true" default:"true"`
+
+	// Connection pool sizing, shared by the Slack event handlers, the HTTP
+	// server and the background workers.
+	MaxConns          int32         `split_words:"true" default:"20"`
+	MinConns          int32         `split_words:"true" default:"4"`
+	MaxConnLifetime   time.Duration `split_words:"true" default:"30m"`
+	MaxConnIdleTime   time.Duration `split_words:"true" default:"5m"`
+	HealthCheckPeriod time.Duration `split_words:"true" default:"1m"`
+
+	// Per-connection cache of prepared statements. It must cover the sqlc
+	// queries plus river's own, or hot statements get re-prepared.
+	StatementCacheCapacity int `split_words:"true" default:"512"`
 }
 
 func (c DatabaseConfig) URL() string {
@@ -49,8 +60,8 @@ func (c DatabaseConfig) URL() string {
 	return dbURL.String()
 }
 
-func New(ctx context.Context, dbURL string) (*pgxpool.Pool, error) {
-	config, err := pgxpool.ParseConfig(dbURL)
+func New(ctx context.Context, c DatabaseConfig) (*pgxpool.Pool, error) {
+	config, err := pgxpool.ParseConfig(c.URL())
 	if err != nil {
 		return nil, fmt.Errorf("parsing database config: %w", err)
 	}
@@ -71,7 +82,7 @@ func New(ctx context.Context, dbURL string) (*pgxpool.Pool, error) {
 	}
 
 	// Ratchet migrations
-	if err := runMigrations(ctx, dbURL); err != nil {
+	if err := runMigrations(ctx, tempPool); err != nil {
 		return nil, fmt.Errorf("applying migrations: %w", err)
 	}
 
@@ -90,6 +101,24 @@ func New(ctx context.Context, dbURL string) (*pgxpool.Pool, error) {
 		return nil, fmt.Errorf("creating db tracer: %w", err)
 	}
 	config.ConnConfig.Tracer = tracer
+	if c.MaxConns > 0 {
+		config.MaxConns = c.MaxConns
+	}
+	if c.MinConns > 0 {
+		config.MinConns = c.MinConns
+	}
+	if c.MaxConnLifetime > 0 {
+		config.MaxConnLifetime = c.MaxConnLifetime
+	}
+	if c.MaxConnIdleTime > 0 {
+		config.MaxConnIdleTime = c.MaxConnIdleTime
+	}
+	if c.HealthCheckPeriod > 0 {
+		config.HealthCheckPeriod = c.HealthCheckPeriod
+	}
+	if c.StatementCacheCapacity > 0 {
+		config.ConnConfig.StatementCacheCapacity = c.StatementCacheCapacity
+	}
 
 	pool, err := pgxpool.NewWithConfig(ctx, config)
 	if err != nil {
@@ -100,17 +129,8 @@ func New(ctx context.Context, dbURL string) (*pgxpool.Pool, error) {
 	return pool, nil
 }
 
-func runMigrations(ctx context.Context, dbURL string) error {
-	db, err := sql.Open("postgres", dbURL)
-	if err != nil {
-		return fmt.Errorf("opening migration database: %w", err)
-	}
-	defer db.Close()
-
-	if err := db.PingContext(ctx); err != nil {
-		return fmt.Errorf("connecting migration database: %w", err)
-	}
-	if _, err := db.ExecContext(ctx, `CREATE TABLE IF NOT EXISTS schema_migrations (version bigint NOT NULL PRIMARY KEY, dirty boolean NOT NULL)`); err != nil {
+func runMigrations(ctx context.Context, db *pgxpool.Pool) error {
+	if _, err := db.Exec(ctx, `CREATE TABLE IF NOT EXISTS schema_migrations (version bigint NOT NULL PRIMARY KEY, dirty boolean NOT NULL)`); err != nil {
 		return fmt.Errorf("creating schema migrations table: %w", err)
 	}
 
@@ -148,7 +168,9 @@ func runMigrations(ctx context.Context, dbURL string) error {
 		if err := recordMigrationVersion(ctx, db, version, true); err != nil {
 			return err
 		}
-		if _, err := db.ExecContext(ctx, string(contents)); err != nil {
+		// Exec without arguments uses the simple protocol, which allows the
+		// multi-statement migration files.
+		if _, err := db.Exec(ctx, string(contents)); err != nil {
 			return fmt.Errorf("applying migration %s: %w", name, err)
 		}
 		if err := recordMigrationVersion(ctx, db, version, false); err != nil {
@@ -160,11 +182,11 @@ func runMigrations(ctx context.Context, dbURL string) error {
 	return nil
 }
 
-func currentMigrationVersion(ctx context.Context, db *sql.DB) (int, bool, error) {
+func currentMigrationVersion(ctx context.Context, db *pgxpool.Pool) (int, bool, error) {
 	var version int
 	var dirty bool
-	err := db.QueryRowContext(ctx, `SELECT version, dirty FROM schema_migrations LIMIT 1`).Scan(&version, &dirty)
-	if errors.Is(err, sql.ErrNoRows) {
+	err := db.QueryRow(ctx, `SELECT version, dirty FROM schema_migrations LIMIT 1`).Scan(&version, &dirty)
+	if errors.Is(err, pgx.ErrNoRows) {
 		return 0, false, nil
 	}
 	if err != nil {
@@ -173,11 +195,11 @@ func currentMigrationVersion(ctx context.Context, db *sql.DB) (int, bool, error)
 	return version, dirty, nil
 }
 
-func recordMigrationVersion(ctx context.Context, db *sql.DB, version int, dirty bool) error {
-	if _, err := db.ExecContext(ctx, `DELETE FROM schema_migrations`); err != nil {
+func recordMigrationVersion(ctx context.Context, db *pgxpool.Pool, version int, dirty bool) error {
+	if _, err := db.Exec(ctx, `DELETE FROM schema_migrations`); err != nil {
 		return fmt.Errorf("clearing schema migration version: %w", err)
 	}
-	if _, err := db.ExecContext(ctx, `INSERT INTO schema_migrations (version, dirty) VALUES ($1, $2)`, version, dirty); err != nil {
+	if _, err := db.Exec(ctx, `INSERT INTO schema_migrations (version, dirty) VALUES ($1, $2)`, version, dirty); err != nil {
 		return fmt.Errorf("recording migration version %d: %w", version, err)
 	}
 	return nil
@@ -2,12 +2,13 @@ package storage
 
 import (
 	"context"
+	"encoding/json"
+	"errors"
 	"fmt"
-	"net"
-	"strconv"
 	"strings"
 	"testing"
 
+	"github.com/jackc/pgx/v5"
 	"github.com/jackc/pgx/v5/pgxpool"
 	"github.com/pgvector/pgvector-go"
 	"github.com/stretchr/testify/require"
@@ -16,54 +17,16 @@ import (
 	"github.com/dynoinc/ratchet/internal/storage/schema/dto"
 )
 
-func requireDocker(t *testing.T) {
-	t.Helper()
-	if err := runDocker(t.Context(), "info"); err != nil {
-		t.Skipf("docker not available: %v", err)
-	}
-}
-
 func setupTestDB(t *testing.T) *pgxpool.Pool {
-	requireDocker(t)
-
 	ctx := t.Context()
-	containerName := testContainerName(t)
-	_ = runDocker(context.Background(), "rm", "--force", containerName)
-	_, err := dockerOutput(ctx,
-		"run",
-		"--rm",
-		"--detach",
-		"--name", containerName,
-		"--env", "POSTGRES_USER=postgres",
-		"--env", "POSTGRES_PASSWORD=password",
-		"--env", "POSTGRES_DB=ratchet",
-		"--publish", "127.0.0.1::5432",
-		postgresImage,
-	)
-	require.NoError(t, err)
-	t.Cleanup(func() { _ = runDocker(context.Background(), "rm", "--force", containerName) })
-
-	endpoint, err := dockerOutput(ctx, "port", containerName, "5432/tcp")
-	require.NoError(t, err)
-	host, portString, err := net.SplitHostPort(strings.Split(endpoint, "\n")[0])
-	require.NoError(t, err)
-	if host == "" || host == "0.0.0.0" || host == "::" {
-		host = "127.0.0.1"
+	config, stop, err := StartEphemeralPostgresContainer(ctx, testContainerName(t))
+	if errors.Is(err, ErrDockerUnavailable) {
+		t.Skip(err)
 	}
-	port, err := strconv.Atoi(portString)
 	require.NoError(t, err)
+	t.Cleanup(stop)
 
-	config := DatabaseConfig{
-		Host:       host,
-		Port:       port,
-		User:       "postgres",
-		Pass:       "password",
-		Name:       "ratchet",
-		DisableTLS: true,
-	}
-	require.NoError(t, checkPostgresReady(ctx, config, 10))
-
-	pool, err := New(ctx, config.URL())
+	pool, err := New(ctx, config)
 	require.NoError(t, err)
 	return pool
 }
@@ -73,14 +36,57 @@ func testContainerName(t *testing.T) string {
 	return fmt.Sprintf("ratchet-test-%s", name)
 }
 
+// addChannel stores a channel the way the bot does when it first sees it.
+func addChannel(ctx context.Context, db *pgxpool.Pool, id string) (schema.ChannelsV2, error) {
+	return schema.New(db).StartChannelOnboarding(ctx, schema.StartChannelOnboardingParams{
+		ID:    id,
+		Attrs: dto.ChannelAttrs{OnboardingStatus: dto.OnboardingStatusFinished},
+	})
+}
+
+// message is a single message to store with addMessage. A message with a
+// ParentTs is stored as a thread reply.
+type message struct {
+	ChannelID string
+	ParentTs  string
+	Ts        string
+	Attrs     dto.MessageAttrs
+}
+
+// addMessage stores m with the batch insert queries the bot uses and reports
+// whether it was inserted.
+func addMessage(ctx context.Context, db *pgxpool.Pool, m message) (bool, error) {
+	attrs, err := json.Marshal(m.Attrs)
+	if err != nil {
+		return false, err
+	}
+
+	var inserted []string
+	if m.ParentTs == "" {
+		inserted, err = schema.New(db).AddMessages(ctx, schema.AddMessagesParams{
+			ChannelID: m.ChannelID,
+			Ts:        []string{m.Ts},
+			Attrs:     [][]byte{attrs},
+		})
+	} else {
+		inserted, err = schema.New(db).AddThreadMessages(ctx, schema.AddThreadMessagesParams{
+			ChannelID: m.ChannelID,
+			ParentTs:  []string{m.ParentTs},
+			Ts:        []string{m.Ts},
+			Attrs:     [][]byte{attrs},
+		})
+	}
+	return len(inserted) > 0, err
+}
+
 func TestUpdateReaction(t *testing.T) {
 	db := setupTestDB(t)
 	ctx := t.Context()
 
-	_, err := schema.New(db).AddChannel(ctx, "C0706000000")
+	_, err := addChannel(ctx, db, "C0706000000")
 	require.NoError(t, err)
 
-	inserted, err := schema.New(db).AddMessage(ctx, schema.AddMessageParams{
+	inserted, err := addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		Ts:        "1714358400.000000",
 		Attrs:     dto.MessageAttrs{},
@@ -164,6 +170,134 @@ func TestUpdateReaction(t *testing.T) {
 	require.Empty(t, msg.Attrs.Reactions)
 }
 
+func TestStartChannelOnboarding(t *testing.T) {
+	db := setupTestDB(t)
+	ctx := t.Context()
+
+	params := schema.StartChannelOnboardingParams{
+		ID:    "C0706000000",
+		Attrs: dto.ChannelAttrs{OnboardingStatus: dto.OnboardingStatusStarted},
+	}
+
+	channel, err := schema.New(db).StartChannelOnboarding(ctx, params)
+	require.NoError(t, err)
+	require.Equal(t, dto.OnboardingStatusStarted, channel.Attrs.OnboardingStatus)
+
+	// A channel that already has attributes is left alone.
+	_, err = schema.New(db).StartChannelOnboarding(ctx, params)
+	require.ErrorIs(t, err, pgx.ErrNoRows)
+
+	// A channel added without attributes is picked up.
+	_, err = db.Exec(ctx, "INSERT INTO channels_v2 (id) VALUES ($1)", "C0706000001")
+	require.NoError(t, err)
+
+	params.ID = "C0706000001"
+	channel, err = schema.New(db).StartChannelOnboarding(ctx, params)
+	require.NoError(t, err)
+	require.Equal(t, dto.OnboardingStatusStarted, channel.Attrs.OnboardingStatus)
+}
+
+func TestGetAllMessagesByChannelName(t *testing.T) {
+	db := setupTestDB(t)
+	ctx := t.Context()
+
+	_, err := addChannel(ctx, db, "C0706000000")
+	require.NoError(t, err)
+	err = schema.New(db).UpdateChannelAttrs(ctx, schema.UpdateChannelAttrsParams{
+		ID:    "C0706000000",
+		Attrs: dto.ChannelAttrs{Name: "general"},
+	})
+	require.NoError(t, err)
+
+	attrs, err := json.Marshal(dto.MessageAttrs{Message: dto.SlackMessage{Text: "hello"}})
+	require.NoError(t, err)
+	_, err = schema.New(db).AddMessages(ctx, schema.AddMessagesParams{
+		ChannelID: "C0706000000",
+		Ts:        []string{"1714358400.000000", "1714358401.000000", "1714358402.000000"},
+		Attrs:     [][]byte{attrs, attrs, attrs},
+	})
+	require.NoError(t, err)
+
+	messages, err := schema.New(db).GetAllMessagesByChannelName(ctx, schema.GetAllMessagesByChannelNameParams{
+		ChannelName: "general",
+		N:           2,
+	})
+	require.NoError(t, err)
+	require.Len(t, messages, 2)
+	require.Equal(t, "1714358402.000000", messages[0].Ts)
+	require.Equal(t, "1714358401.000000", messages[1].Ts)
+
+	messages, err = schema.New(db).GetAllMessagesByChannelName(ctx, schema.GetAllMessagesByChannelNameParams{
+		ChannelName: "random",
+		N:           2,
+	})
+	require.NoError(t, err)
+	require.Empty(t, messages)
+}
+
+func TestAddMessagesBatch(t *testing.T) {
+	db := setupTestDB(t)
+	ctx := t.Context()
+
+	_, err := addChannel(ctx, db, "C0706000000")
+	require.NoError(t, err)
+
+	attrs, err := json.Marshal(dto.MessageAttrs{Message: dto.SlackMessage{Text: "hello", User: "U12345"}})
+	require.NoError(t, err)
+
+	inserted, err := schema.New(db).AddMessages(ctx, schema.AddMessagesParams{
+		ChannelID: "C0706000000",
+		Ts:        []string{"1714358400.000000", "1714358401.000000"},
+		Attrs:     [][]byte{attrs, attrs},
+	})
+	require.NoError(t, err)
+	require.ElementsMatch(t, []string{"1714358400.000000", "1714358401.000000"}, inserted)
+
+	// Re-inserting returns only the new rows.
+	inserted, err = schema.New(db).AddMessages(ctx, schema.AddMessagesParams{
+		ChannelID: "C0706000000",
+		Ts:        []string{"1714358401.000000", "1714358402.000000"},
+		Attrs:     [][]byte{attrs, attrs},
+	})
+	require.NoError(t, err)
+	require.Equal(t, []string{"1714358402.000000"}, inserted)
+
+	msg, err := schema.New(db).GetMessage(ctx, schema.GetMessageParams{
+		ChannelID: "C0706000000",
+		Ts:        "1714358402.000000",
+	})
+	require.NoError(t, err)
+	require.Equal(t, "hello", msg.Attrs.Message.Text)
+
+	inserted, err = schema.New(db).AddThreadMessages(ctx, schema.AddThreadMessagesParams{
+		ChannelID: "C0706000000",
+		ParentTs:  []string{"1714358400.000000", "1714358400.000000"},
+		Ts:        []string{"1714358403.000000", "1714358404.000000"},
+		Attrs:     [][]byte{attrs, attrs},
+	})
+	require.NoError(t, err)
+	require.Len(t, inserted, 2)
+
+	replies, err := schema.New(db).GetThreadMessages(ctx, schema.GetThreadMessagesParams{
+		ChannelID: "C0706000000",
+		ParentTs:  "1714358400.000000",
+		BotID:     "",
+		LimitVal:  100,
+	})
+	require.NoError(t, err)
+	require.Len(t, replies, 2)
+
+	// Replies for an unknown channel are skipped instead of failing.
+	inserted, err = schema.New(db).AddThreadMessages(ctx, schema.AddThreadMessagesParams{
+		ChannelID: "C0706999999",
+		ParentTs:  []string{"1714358400.000000"},
+		Ts:        []string{"1714358405.000000"},
+		Attrs:     [][]byte{attrs},
+	})
+	require.NoError(t, err)
+	require.Empty(t, inserted)
+}
+
 func TestInsertDocWithEmbeddings(t *testing.T) {
 	db := setupTestDB(t)
 	ctx := t.Context()
@@ -215,7 +349,7 @@ func TestSearchMessagesHybrid(t *testing.T) {
 	ctx := t.Context()
 
 	// Add a channel
-	_, err := schema.New(db).AddChannel(ctx, "C0706000000")
+	_, err := addChannel(ctx, db, "C0706000000")
 	require.NoError(t, err)
 
 	// Create a vector with 768 dimensions for embedding
@@ -226,7 +360,7 @@ func TestSearchMessagesHybrid(t *testing.T) {
 	newVec := pgvector.NewVector(embedVector)
 
 	// Add messages with text
-	_, err = schema.New(db).AddMessage(ctx, schema.AddMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		Ts:        "1714358400.000000",
 		Attrs: dto.MessageAttrs{
@@ -247,7 +381,7 @@ func TestSearchMessagesHybrid(t *testing.T) {
 	})
 	require.NoError(t, err)
 
-	_, err = schema.New(db).AddMessage(ctx, schema.AddMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		Ts:        "1714358401.000000",
 		Attrs: dto.MessageAttrs{
@@ -269,7 +403,7 @@ func TestSearchMessagesHybrid(t *testing.T) {
 	require.NoError(t, err)
 
 	// Add a bot message that should be filtered out
-	_, err = schema.New(db).AddMessage(ctx, schema.AddMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		Ts:        "1714358402.000000",
 		Attrs: dto.MessageAttrs{
@@ -291,7 +425,7 @@ func TestSearchMessagesHybrid(t *testing.T) {
 	require.NoError(t, err)
 
 	// Add a thread reply that should also be searchable
-	_, err = schema.New(db).AddThreadMessage(ctx, schema.AddThreadMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		ParentTs:  "1714358400.000000", // Reply to first message
 		Ts:        "1714358403.000000",
@@ -353,11 +487,11 @@ func TestGetThreadMessages(t *testing.T) {
 	ctx := t.Context()
 
 	// Add a channel
-	_, err := schema.New(db).AddChannel(ctx, "C0706000000")
+	_, err := addChannel(ctx, db, "C0706000000")
 	require.NoError(t, err)
 
 	// Add parent message
-	_, err = schema.New(db).AddMessage(ctx, schema.AddMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		Ts:        "1714358400.000000",
 		Attrs: dto.MessageAttrs{
@@ -370,7 +504,7 @@ func TestGetThreadMessages(t *testing.T) {
 	require.NoError(t, err)
 
 	// Add thread replies
-	_, err = schema.New(db).AddThreadMessage(ctx, schema.AddThreadMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		ParentTs:  "1714358400.000000",
 		Ts:        "1714358401.000000",
@@ -383,7 +517,7 @@ func TestGetThreadMessages(t *testing.T) {
 	})
 	require.NoError(t, err)
 
-	_, err = schema.New(db).AddThreadMessage(ctx, schema.AddThreadMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		ParentTs:  "1714358400.000000",
 		Ts:        "1714358402.000000",
@@ -433,16 +567,56 @@ func TestGetThreadMessages(t *testing.T) {
 	require.Len(t, results, 0) // No messages in nonexistent thread
 }
 
+func TestGetThreadMessagesByParents(t *testing.T) {
+	db := setupTestDB(t)
+	ctx := t.Context()
+
+	_, err := addChannel(ctx, db, "C0706000000")
+	require.NoError(t, err)
+
+	attrs, err := json.Marshal(dto.MessageAttrs{Message: dto.SlackMessage{Text: "reply", User: "U12345"}})
+	require.NoError(t, err)
+
+	_, err = schema.New(db).AddMessages(ctx, schema.AddMessagesParams{
+		ChannelID: "C0706000000",
+		Ts:        []string{"1714358400.000000", "1714358500.000000"},
+		Attrs:     [][]byte{attrs, attrs},
+	})
+	require.NoError(t, err)
+
+	_, err = schema.New(db).AddThreadMessages(ctx, schema.AddThreadMessagesParams{
+		ChannelID: "C0706000000",
+		ParentTs:  []string{"1714358400.000000", "1714358400.000000", "1714358400.000000", "1714358500.000000"},
+		Ts:        []string{"1714358401.000000", "1714358402.000000", "1714358403.000000", "1714358501.000000"},
+		Attrs:     [][]byte{attrs, attrs, attrs, attrs},
+	})
+	require.NoError(t, err)
+
+	results, err := schema.New(db).GetThreadMessagesByParents(ctx, schema.GetThreadMessagesByParentsParams{
+		ChannelID: "C0706000000",
+		ParentTs:  []string{"1714358400.000000", "1714358500.000000"},
+		LimitVal:  2,
+	})
+	require.NoError(t, err)
+	require.Len(t, results, 3)
+
+	// Latest replies per parent, in ascending order.
+	require.Equal(t, "1714358402.000000", results[0].Ts)
+	require.Equal(t, "1714358403.000000", results[1].Ts)
+	require.Equal(t, "1714358501.000000", results[2].Ts)
+	require.Equal(t, "1714358500.000000", *results[2].ParentTs)
+}
+
 func TestGetThreadMessagesWithParent(t *testing.T) {
 	db := setupTestDB(t)
 	ctx := t.Context()
 
 	// Add a channel
-	_, err := schema.New(db).AddChannel(ctx, "C0706000000")
+	_, err := addChannel(ctx, db, "C0706000000")
 	require.NoError(t, err)
 
 	// Add parent message
-	_, err = schema.New(db).AddMessage(ctx, schema.AddMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		Ts:        "1714358400.000000",
 		Attrs: dto.MessageAttrs{
@@ -455,7 +629,7 @@ func TestGetThreadMessagesWithParent(t *testing.T) {
 	require.NoError(t, err)
 
 	// Add thread replies
-	_, err = schema.New(db).AddThreadMessage(ctx, schema.AddThreadMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		ParentTs:  "1714358400.000000",
 		Ts:        "1714358401.000000",
@@ -468,7 +642,7 @@ func TestGetThreadMessagesWithParent(t *testing.T) {
 	})
 	require.NoError(t, err)
 
-	_, err = schema.New(db).AddThreadMessage(ctx, schema.AddThreadMessageParams{
+	_, err = addMessage(ctx, db, message{
 		ChannelID: "C0706000000",
 		ParentTs:  "1714358400.000000",
 		Ts:        "1714358402.000000",
@@ -2,10 +2,13 @@ package storage
 
 import (
 	"context"
+	"errors"
 	"fmt"
 	"log/slog"
 	"math"
+	"net"
 	"os/exec"
+	"strconv"
 	"strings"
 	"time"
 
@@ -63,6 +66,69 @@ func StartPostgresContainer(ctx context.Context, c DatabaseConfig) error {
 	return nil
 }
 
+// ErrDockerUnavailable is returned by StartEphemeralPostgresContainer when
+// docker cannot be used.
+var ErrDockerUnavailable = errors.New("docker not available")
+
+// StartEphemeralPostgresContainer starts a throwaway PostgreSQL container
+// named name on a random local port and waits until it is ready. The
+// returned stop function removes the container.
+func StartEphemeralPostgresContainer(ctx context.Context, name string) (DatabaseConfig, func(), error) {
+	if err := runDocker(ctx, "info"); err != nil {
+		return DatabaseConfig{}, nil, fmt.Errorf("%w: %w", ErrDockerUnavailable, err)
+	}
+
+	_ = runDocker(context.Background(), "rm", "--force", name)
+	if err := runDocker(ctx,
+		"run",
+		"--rm",
+		"--detach",
+		"--name", name,
+		"--env", "POSTGRES_USER=postgres",
+		"--env", "POSTGRES_PASSWORD=password",
+		"--env", "POSTGRES_DB=ratchet",
+		"--publish", "127.0.0.1::5432",
+		postgresImage,
+	); err != nil {
+		return DatabaseConfig{}, nil, fmt.Errorf("starting container: %w", err)
+	}
+	stop := func() { _ = runDocker(context.Background(), "rm", "--force", name) }
+
+	endpoint, err := dockerOutput(ctx, "port", name, "5432/tcp")
+	if err != nil {
+		stop()
+		return DatabaseConfig{}, nil, fmt.Errorf("getting container port: %w", err)
+	}
+	host, portString, err := net.SplitHostPort(strings.Split(endpoint, "\n")[0])
+	if err != nil {
+		stop()
+		return DatabaseConfig{}, nil, fmt.Errorf("parsing container endpoint %q: %w", endpoint, err)
+	}
+	if host == "" || host == "0.0.0.0" || host == "::" {
+		host = "127.0.0.1"
+	}
+	port, err := strconv.Atoi(portString)
+	if err != nil {
+		stop()
+		return DatabaseConfig{}, nil, fmt.Errorf("parsing container port %q: %w", portString, err)
+	}
+
+	c := DatabaseConfig{
+		Host:       host,
+		Port:       port,
+		User:       "postgres",
+		Pass:       "password",
+		Name:       "ratchet",
+		DisableTLS: true,
+	}
+	if err := checkPostgresReady(ctx, c, 10); err != nil {
+		stop()
+		return DatabaseConfig{}, nil, fmt.Errorf("PostgreSQL readiness check: %w", err)
+	}
+
+	return c, stop, nil
+}
+
 // checkPostgresReady checks if PostgreSQL is ready by pinging it.
 func checkPostgresReady(ctx context.Context, c DatabaseConfig, attempts int) error {
 	pool, err := pgxpool.New(ctx, c.URL())
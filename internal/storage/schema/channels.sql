@@ -1,8 +1,10 @@
--- name: AddChannel :one
-INSERT INTO channels_v2 (id)
-VALUES (@id)
+-- name: StartChannelOnboarding :one
+INSERT INTO channels_v2 (id, attrs)
+VALUES (@id, @attrs)
 ON CONFLICT (id) DO UPDATE
-    SET id = EXCLUDED.id
+    SET attrs = EXCLUDED.attrs
+    WHERE channels_v2.attrs IS NULL
+       OR channels_v2.attrs = '{}' :: jsonb
 RETURNING id,
     attrs;
 
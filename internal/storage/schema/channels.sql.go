@@ -11,22 +11,6 @@ import (
 	dto "github.com/dynoinc/ratchet/internal/storage/schema/dto"
 )
 
-const addChannel = `-- name: AddChannel :one
-INSERT INTO channels_v2 (id)
-VALUES ($1)
-ON CONFLICT (id) DO UPDATE
-    SET id = EXCLUDED.id
-RETURNING id,
-    attrs
-`
-
-func (q *Queries) AddChannel(ctx context.Context, id string) (ChannelsV2, error) {
-	row := q.db.QueryRow(ctx, addChannel, id)
-	var i ChannelsV2
-	err := row.Scan(&i.ID, &i.Attrs)
-	return i, err
-}
-
 const countChannels = `-- name: CountChannels :one
 SELECT COUNT(*)
 FROM channels_v2
@@ -120,6 +104,29 @@ func (q *Queries) GetChannels(ctx context.Context, ids []string) ([]ChannelsV2,
 	return items, nil
 }
 
+const startChannelOnboarding = `-- name: StartChannelOnboarding :one
+INSERT INTO channels_v2 (id, attrs)
+VALUES ($1, $2)
+ON CONFLICT (id) DO UPDATE
+    SET attrs = EXCLUDED.attrs
+    WHERE channels_v2.attrs IS NULL
+       OR channels_v2.attrs = '{}' :: jsonb
+RETURNING id,
+    attrs
+`
+
+type StartChannelOnboardingParams struct {
+	ID    string
+	Attrs dto.ChannelAttrs
+}
+
+func (q *Queries) StartChannelOnboarding(ctx context.Context, arg StartChannelOnboardingParams) (ChannelsV2, error) {
+	row := q.db.QueryRow(ctx, startChannelOnboarding, arg.ID, arg.Attrs)
+	var i ChannelsV2
+	err := row.Scan(&i.ID, &i.Attrs)
+	return i, err
+}
+
 const updateChannelAttrs = `-- name: UpdateChannelAttrs :exec
 UPDATE
     channels_v2
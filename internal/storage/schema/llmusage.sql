@@ -1,8 +1,6 @@
--- name: AddLLMUsage :one
+-- name: AddLLMUsage :exec
 INSERT INTO llmusageV1 (input, output, model)
-VALUES (@input, @output, @model)
-RETURNING
-    id, input, output, model, timestamp;
+VALUES (@input, @output, @model);
 
 -- name: GetLLMUsageByTimeRange :many
 SELECT id,
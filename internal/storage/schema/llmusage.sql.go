@@ -13,11 +13,9 @@ import (
 	dto "github.com/dynoinc/ratchet/internal/storage/schema/dto"
 )
 
-const addLLMUsage = `-- name: AddLLMUsage :one
+const addLLMUsage = `-- name: AddLLMUsage :exec
 INSERT INTO llmusageV1 (input, output, model)
 VALUES ($1, $2, $3)
-RETURNING
-    id, input, output, model, timestamp
 `
 
 type AddLLMUsageParams struct {
@@ -26,17 +24,9 @@ type AddLLMUsageParams struct {
 	Model  string
 }
 
-func (q *Queries) AddLLMUsage(ctx context.Context, arg AddLLMUsageParams) (Llmusagev1, error) {
-	row := q.db.QueryRow(ctx, addLLMUsage, arg.Input, arg.Output, arg.Model)
-	var i Llmusagev1
-	err := row.Scan(
-		&i.ID,
-		&i.Input,
-		&i.Output,
-		&i.Model,
-		&i.Timestamp,
-	)
-	return i, err
+func (q *Queries) AddLLMUsage(ctx context.Context, arg AddLLMUsageParams) error {
+	_, err := q.db.Exec(ctx, addLLMUsage, arg.Input, arg.Output, arg.Model)
+	return err
 }
 
 const getLLMUsageByModel = `-- name: GetLLMUsageByModel :many
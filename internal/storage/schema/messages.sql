@@ -1,20 +1,20 @@
--- name: AddMessage :one
-WITH ins AS (
-    INSERT INTO messages_v3 (channel_id, ts, attrs)
-    VALUES (@channel_id, @ts, @attrs)
-    ON CONFLICT (channel_id, ts) DO NOTHING
-    RETURNING 1
-)
-SELECT EXISTS (SELECT 1 FROM ins) AS inserted;
+-- name: AddMessages :many
+INSERT INTO messages_v3 (channel_id, ts, attrs)
+SELECT @channel_id :: text,
+       unnest(@ts :: text[]),
+       unnest(@attrs :: jsonb[])
+ON CONFLICT (channel_id, ts) DO NOTHING
+RETURNING ts;
 
--- name: AddThreadMessage :one
-WITH ins AS (
-    INSERT INTO messages_v3 (channel_id, parent_ts, ts, attrs)
-    VALUES (@channel_id, @parent_ts :: text, @ts, @attrs)
-    ON CONFLICT (channel_id, ts) DO NOTHING
-    RETURNING 1
-)
-SELECT EXISTS (SELECT 1 FROM ins) AS inserted;
+-- name: AddThreadMessages :many
+INSERT INTO messages_v3 (channel_id, parent_ts, ts, attrs)
+SELECT @channel_id :: text,
+       unnest(@parent_ts :: text[]),
+       unnest(@ts :: text[]),
+       unnest(@attrs :: jsonb[])
+WHERE EXISTS (SELECT 1 FROM channels_v2 WHERE id = @channel_id)
+ON CONFLICT (channel_id, ts) DO NOTHING
+RETURNING ts;
 
 -- name: UpdateReaction :exec
 WITH reaction_count AS (SELECT COALESCE((attrs -> 'reactions' ->> (@reaction::text))::int, 0) + @count::int AS new_count
@@ -50,8 +50,7 @@ WHERE channel_id = @channel_id
 -- name: GetMessage :one
 SELECT channel_id,
        ts,
-       attrs,
-       embedding
+       attrs
 FROM messages_v3
 WHERE channel_id = @channel_id
   AND ts = @ts;
@@ -66,6 +65,17 @@ WHERE channel_id = @channel_id
 ORDER BY (ts::float) DESC
 LIMIT @n;
 
+-- name: GetAllMessagesByChannelName :many
+SELECT m.channel_id,
+       m.ts,
+       m.attrs
+FROM messages_v3 m
+         JOIN channels_v2 c ON c.id = m.channel_id
+WHERE c.attrs ->> 'name' = @channel_name :: text
+  AND m.parent_ts IS NULL
+ORDER BY (m.ts::float) DESC
+LIMIT @n;
+
 -- name: GetMessagesWithinTS :many
 SELECT channel_id,
        ts,
@@ -133,6 +143,24 @@ FROM (
 ) subquery
 ORDER BY (ts::float) ASC;
 
+-- name: GetThreadMessagesByParents :many
+SELECT channel_id,
+       parent_ts,
+       ts,
+       attrs
+FROM (
+    SELECT channel_id,
+           parent_ts,
+           ts,
+           attrs,
+           ROW_NUMBER() OVER (PARTITION BY parent_ts ORDER BY (ts::float) DESC) AS rn
+    FROM messages_v3
+    WHERE channel_id = @channel_id
+      AND parent_ts = ANY (@parent_ts :: text[])
+) subquery
+WHERE rn <= @limit_val :: int
+ORDER BY parent_ts, (ts::float) ASC;
+
 -- name: GetThreadMessagesWithParent :many
 WITH parent_message AS (
     -- Get the parent message
@@ -187,11 +215,7 @@ WHERE m.attrs -> 'incident_action' ->> 'service' = @service :: text
 DELETE
 FROM messages_v3
 WHERE channel_id = @channel_id
-  AND CAST(ts AS numeric) < EXTRACT(
-        epoch
-        FROM
-        NOW() - @older_than :: interval
-                            );
+  AND ts::float < EXTRACT(epoch FROM NOW() - @older_than :: interval)::float;
 
 -- name: GetLatestServiceUpdates :many
 WITH valid_messages AS (SELECT channel_id,
@@ -204,11 +228,7 @@ WITH valid_messages AS (SELECT channel_id,
                                    ELSE ts_rank(tsvec, plainto_tsquery('english', @query_text :: text))
                                    END as lexical_score
                         FROM messages_v3
-                        WHERE CAST(SPLIT_PART(ts, '.', 1) AS numeric) > EXTRACT(
-                                epoch
-                                FROM
-                                NOW() - @interval :: interval
-                                                                        )
+                        WHERE ts::float > EXTRACT(epoch FROM NOW() - @interval :: interval)::float
                           AND attrs -> 'message' ->> 'user' != @bot_id :: text
                           AND attrs -> 'incident_action' ->> 'action' IS NULL),
      semantic_matches AS (SELECT channel_id,
@@ -259,11 +279,7 @@ WITH valid_messages AS (SELECT channel_id,
                                tsvec                                           as text_tokens,
                                plainto_tsquery('english', @query_text :: text) as query_tokens
                         FROM messages_v3
-                        WHERE CAST(SPLIT_PART(ts, '.', 1) AS numeric) > EXTRACT(
-                                epoch
-                                FROM
-                                NOW() - @interval :: interval
-                                                                        )
+                        WHERE ts::float > EXTRACT(epoch FROM NOW() - @interval :: interval)::float
                           AND attrs -> 'message' ->> 'user' != @bot_id :: text
                           AND attrs -> 'incident_action' ->> 'action' IS NULL),
      semantic_matches AS (SELECT channel_id,
@@ -14,56 +14,82 @@ import (
 	dto "github.com/dynoinc/ratchet/internal/storage/schema/dto"
 )
 
-const addMessage = `-- name: AddMessage :one
-WITH ins AS (
-    INSERT INTO messages_v3 (channel_id, ts, attrs)
-    VALUES ($1, $2, $3)
-    ON CONFLICT (channel_id, ts) DO NOTHING
-    RETURNING 1
-)
-SELECT EXISTS (SELECT 1 FROM ins) AS inserted
+const addMessages = `-- name: AddMessages :many
+INSERT INTO messages_v3 (channel_id, ts, attrs)
+SELECT $1 :: text,
+       unnest($2 :: text[]),
+       unnest($3 :: jsonb[])
+ON CONFLICT (channel_id, ts) DO NOTHING
+RETURNING ts
 `
 
-type AddMessageParams struct {
+type AddMessagesParams struct {
 	ChannelID string
-	Ts        string
-	Attrs     dto.MessageAttrs
+	Ts        []string
+	Attrs     [][]byte
 }
 
-func (q *Queries) AddMessage(ctx context.Context, arg AddMessageParams) (bool, error) {
-	row := q.db.QueryRow(ctx, addMessage, arg.ChannelID, arg.Ts, arg.Attrs)
-	var inserted bool
-	err := row.Scan(&inserted)
-	return inserted, err
+func (q *Queries) AddMessages(ctx context.Context, arg AddMessagesParams) ([]string, error) {
+	rows, err := q.db.Query(ctx, addMessages, arg.ChannelID, arg.Ts, arg.Attrs)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	var items []string
+	for rows.Next() {
+		var ts string
+		if err := rows.Scan(&ts); err != nil {
+			return nil, err
+		}
+		items = append(items, ts)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	return items, nil
 }
 
-const addThreadMessage = `-- name: AddThreadMessage :one
-WITH ins AS (
-    INSERT INTO messages_v3 (channel_id, parent_ts, ts, attrs)
-    VALUES ($1, $2 :: text, $3, $4)
-    ON CONFLICT (channel_id, ts) DO NOTHING
-    RETURNING 1
-)
-SELECT EXISTS (SELECT 1 FROM ins) AS inserted
+const addThreadMessages = `-- name: AddThreadMessages :many
+INSERT INTO messages_v3 (channel_id, parent_ts, ts, attrs)
+SELECT $1 :: text,
+       unnest($2 :: text[]),
+       unnest($3 :: text[]),
+       unnest($4 :: jsonb[])
+WHERE EXISTS (SELECT 1 FROM channels_v2 WHERE id = $1)
+ON CONFLICT (channel_id, ts) DO NOTHING
+RETURNING ts
 `
 
-type AddThreadMessageParams struct {
+type AddThreadMessagesParams struct {
 	ChannelID string
-	ParentTs  string
-	Ts        string
-	Attrs     dto.MessageAttrs
+	ParentTs  []string
+	Ts        []string
+	Attrs     [][]byte
 }
 
-func (q *Queries) AddThreadMessage(ctx context.Context, arg AddThreadMessageParams) (bool, error) {
-	row := q.db.QueryRow(ctx, addThreadMessage,
+func (q *Queries) AddThreadMessages(ctx context.Context, arg AddThreadMessagesParams) ([]string, error) {
+	rows, err := q.db.Query(ctx, addThreadMessages,
 		arg.ChannelID,
 		arg.ParentTs,
 		arg.Ts,
 		arg.Attrs,
 	)
-	var inserted bool
-	err := row.Scan(&inserted)
-	return inserted, err
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	var items []string
+	for rows.Next() {
+		var ts string
+		if err := rows.Scan(&ts); err != nil {
+			return nil, err
+		}
+		items = append(items, ts)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	return items, nil
 }
 
 const debugGetLatestServiceUpdates = `-- name: DebugGetLatestServiceUpdates :many
@@ -80,11 +106,7 @@ WITH valid_messages AS (SELECT channel_id,
                                tsvec                                           as text_tokens,
                                plainto_tsquery('english', $1 :: text) as query_tokens
                         FROM messages_v3
-                        WHERE CAST(SPLIT_PART(ts, '.', 1) AS numeric) > EXTRACT(
-                                epoch
-                                FROM
-                                NOW() - $2 :: interval
-                                                                        )
+                        WHERE ts::float > EXTRACT(epoch FROM NOW() - $2 :: interval)::float
                           AND attrs -> 'message' ->> 'user' != $3 :: text
                           AND attrs -> 'incident_action' ->> 'action' IS NULL),
      semantic_matches AS (SELECT channel_id,
@@ -190,11 +212,7 @@ const deleteOldMessages = `-- name: DeleteOldMessages :exec
 DELETE
 FROM messages_v3
 WHERE channel_id = $1
-  AND CAST(ts AS numeric) < EXTRACT(
-        epoch
-        FROM
-        NOW() - $2 :: interval
-                            )
+  AND ts::float < EXTRACT(epoch FROM NOW() - $2 :: interval)::float
 `
 
 type DeleteOldMessagesParams struct {
@@ -306,6 +324,49 @@ func (q *Queries) GetAllMessages(ctx context.Context, arg GetAllMessagesParams)
 	return items, nil
 }
 
+const getAllMessagesByChannelName = `-- name: GetAllMessagesByChannelName :many
+SELECT m.channel_id,
+       m.ts,
+       m.attrs
+FROM messages_v3 m
+         JOIN channels_v2 c ON c.id = m.channel_id
+WHERE c.attrs ->> 'name' = $1 :: text
+  AND m.parent_ts IS NULL
+ORDER BY (m.ts::float) DESC
+LIMIT $2
+`
+
+type GetAllMessagesByChannelNameParams struct {
+	ChannelName string
+	N           int32
+}
+
+type GetAllMessagesByChannelNameRow struct {
+	ChannelID string
+	Ts        string
+	Attrs     dto.MessageAttrs
+}
+
+func (q *Queries) GetAllMessagesByChannelName(ctx context.Context, arg GetAllMessagesByChannelNameParams) ([]GetAllMessagesByChannelNameRow, error) {
+	rows, err := q.db.Query(ctx, getAllMessagesByChannelName, arg.ChannelName, arg.N)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	var items []GetAllMessagesByChannelNameRow
+	for rows.Next() {
+		var i GetAllMessagesByChannelNameRow
+		if err := rows.Scan(&i.ChannelID, &i.Ts, &i.Attrs); err != nil {
+			return nil, err
+		}
+		items = append(items, i)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	return items, nil
+}
+
 const getLatestServiceUpdates = `-- name: GetLatestServiceUpdates :many
 WITH valid_messages AS (SELECT channel_id,
                                ts,
@@ -317,11 +378,7 @@ WITH valid_messages AS (SELECT channel_id,
                                    ELSE ts_rank(tsvec, plainto_tsquery('english', $1 :: text))
                                    END as lexical_score
                         FROM messages_v3
-                        WHERE CAST(SPLIT_PART(ts, '.', 1) AS numeric) > EXTRACT(
-                                epoch
-                                FROM
-                                NOW() - $2 :: interval
-                                                                        )
+                        WHERE ts::float > EXTRACT(epoch FROM NOW() - $2 :: interval)::float
                           AND attrs -> 'message' ->> 'user' != $3 :: text
                           AND attrs -> 'incident_action' ->> 'action' IS NULL),
      semantic_matches AS (SELECT channel_id,
@@ -410,8 +467,7 @@ func (q *Queries) GetLatestServiceUpdates(ctx context.Context, arg GetLatestServ
 const getMessage = `-- name: GetMessage :one
 SELECT channel_id,
        ts,
-       attrs,
-       embedding
+       attrs
 FROM messages_v3
 WHERE channel_id = $1
   AND ts = $2
@@ -426,18 +482,12 @@ type GetMessageRow struct {
 	ChannelID string
 	Ts        string
 	Attrs     dto.MessageAttrs
-	Embedding *pgvector.Vector
 }
 
 func (q *Queries) GetMessage(ctx context.Context, arg GetMessageParams) (GetMessageRow, error) {
 	row := q.db.QueryRow(ctx, getMessage, arg.ChannelID, arg.Ts)
 	var i GetMessageRow
-	err := row.Scan(
-		&i.ChannelID,
-		&i.Ts,
-		&i.Attrs,
-		&i.Embedding,
-	)
+	err := row.Scan(&i.ChannelID, &i.Ts, &i.Attrs)
 	return i, err
 }
 
@@ -668,6 +718,63 @@ func (q *Queries) GetThreadMessagesByServiceAndAlert(ctx context.Context, arg Ge
 	return items, nil
 }
 
+const getThreadMessagesByParents = `-- name: GetThreadMessagesByParents :many
+SELECT channel_id,
+       parent_ts,
+       ts,
+       attrs
+FROM (
+    SELECT channel_id,
+           parent_ts,
+           ts,
+           attrs,
+           ROW_NUMBER() OVER (PARTITION BY parent_ts ORDER BY (ts::float) DESC) AS rn
+    FROM messages_v3
+    WHERE channel_id = $1
+      AND parent_ts = ANY ($2 :: text[])
+) subquery
+WHERE rn <= $3 :: int
+ORDER BY parent_ts, (ts::float) ASC
+`
+
+type GetThreadMessagesByParentsParams struct {
+	ChannelID string
+	ParentTs  []string
+	LimitVal  int32
+}
+
+type GetThreadMessagesByParentsRow struct {
+	ChannelID string
+	ParentTs  *string
+	Ts        string
+	Attrs     dto.MessageAttrs
+}
+
+func (q *Queries) GetThreadMessagesByParents(ctx context.Context, arg GetThreadMessagesByParentsParams) ([]GetThreadMessagesByParentsRow, error) {
+	rows, err := q.db.Query(ctx, getThreadMessagesByParents, arg.ChannelID, arg.ParentTs, arg.LimitVal)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+	var items []GetThreadMessagesByParentsRow
+	for rows.Next() {
+		var i GetThreadMessagesByParentsRow
+		if err := rows.Scan(
+			&i.ChannelID,
+			&i.ParentTs,
+			&i.Ts,
+			&i.Attrs,
+		); err != nil {
+			return nil, err
+		}
+		items = append(items, i)
+	}
+	if err := rows.Err(); err != nil {
+		return nil, err
+	}
+	return items, nil
+}
+
 const getThreadMessagesWithParent = `-- name: GetThreadMessagesWithParent :many
 WITH parent_message AS (
     -- Get the parent message
@@ -0,0 +1,7 @@
+-- Serves the per-channel "latest messages" and time-window scans, which
+-- filter on channel_id and order or range on ts::float.
+--
+-- Built concurrently so writes to messages_v3 are not blocked during the
+-- build. CREATE INDEX CONCURRENTLY cannot run in a transaction, so this file
+-- holds a single statement and no BEGIN/COMMIT.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS messages_v3_channel_ts_float_idx ON messages_v3 (channel_id, (ts::float) DESC);
@@ -0,0 +1,8 @@
+BEGIN;
+
+-- GetChannelByName and the channel name filter in SearchMessagesHybrid.
+-- channels_v2 holds one row per channel, so the lock during the build is
+-- brief. The messages_v3 incident index is built concurrently in 00016.
+CREATE INDEX channels_v2_name_idx ON channels_v2 ((attrs ->> 'name'));
+
+COMMIT;
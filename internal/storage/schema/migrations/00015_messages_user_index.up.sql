@@ -0,0 +1,10 @@
+-- GetMessagesByUser, which filters a time window on ts::float for a single
+-- author across all channels.
+--
+-- Built concurrently so writes to messages_v3 are not blocked during the
+-- build. CREATE INDEX CONCURRENTLY cannot run in a transaction, so this file
+-- holds a single statement and no BEGIN/COMMIT.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS messages_v3_user_ts_float_idx ON messages_v3 (
+    (attrs -> 'message' ->> 'user'),
+    (ts::float)
+);
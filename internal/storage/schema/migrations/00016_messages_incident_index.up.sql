@@ -0,0 +1,10 @@
+-- Incident lookups by service/alert on top-level messages.
+--
+-- Built concurrently so writes to messages_v3 are not blocked during the
+-- build. CREATE INDEX CONCURRENTLY cannot run in a transaction, so this file
+-- holds a single statement and no BEGIN/COMMIT. IF NOT EXISTS covers
+-- databases where 00014 already created the index.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS messages_v3_incident_idx ON messages_v3 (
+    (attrs -> 'incident_action' ->> 'service'),
+    (attrs -> 'incident_action' ->> 'alert')
+) WHERE parent_ts IS NULL;
@@ -0,0 +1,33 @@
+// Package storagetest provides a migrated PostgreSQL database for tests
+// outside the storage package.
+package storagetest
+
+import (
+	"errors"
+	"strings"
+	"testing"
+
+	"github.com/jackc/pgx/v5/pgxpool"
+	"github.com/stretchr/testify/require"
+
+	"github.com/dynoinc/ratchet/internal/storage"
+)
+
+// NewDB starts a throwaway PostgreSQL container for t and returns a pool to
+// its migrated database. The test is skipped when docker is not available.
+func NewDB(t *testing.T) *pgxpool.Pool {
+	t.Helper()
+
+	ctx := t.Context()
+	name := "ratchet-test-" + strings.NewReplacer("/", "-", "_", "-").Replace(strings.ToLower(t.Name()))
+	config, stop, err := storage.StartEphemeralPostgresContainer(ctx, name)
+	if errors.Is(err, storage.ErrDockerUnavailable) {
+		t.Skip(err)
+	}
+	require.NoError(t, err)
+	t.Cleanup(stop)
+
+	pool, err := storage.New(ctx, config)
+	require.NoError(t, err)
+	return pool
+}
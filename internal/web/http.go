@@ -30,6 +30,9 @@ import (
 	"github.com/dynoinc/ratchet/internal/storage/schema"
 )
 
+// errBadRequest marks handler errors caused by invalid request parameters.
+var errBadRequest = errors.New("bad request")
+
 func handleJSON(handler func(*http.Request) (any, error)) http.HandlerFunc {
 	return func(w http.ResponseWriter, r *http.Request) {
 		result, err := handler(r)
@@ -38,6 +41,10 @@ func handleJSON(handler func(*http.Request) (any, error)) http.HandlerFunc {
 				http.Error(w, err.Error(), http.StatusNotFound)
 				return
 			}
+			if errors.Is(err, errBadRequest) {
+				http.Error(w, err.Error(), http.StatusBadRequest)
+				return
+			}
 
 			http.Error(w, err.Error(), http.StatusInternalServerError)
 			return
@@ -58,6 +65,7 @@ func handleJSON(handler func(*http.Request) (any, error)) http.HandlerFunc {
 
 type httpHandlers struct {
 	bot              *internal.Bot
+	queries          *schema.Queries
 	commands         *commands.Commands
 	slackIntegration slack_integration.Integration
 	llmClient        llm.Client
@@ -74,6 +82,7 @@ func New(
 ) (http.Handler, error) {
 	handlers := &httpHandlers{
 		bot:              bot,
+		queries:          schema.New(bot.DB),
 		commands:         commands,
 		slackIntegration: slackIntegration,
 		llmClient:        llmClient,
@@ -149,7 +158,7 @@ func New(
 }
 
 func (h *httpHandlers) listChannels(r *http.Request) (any, error) {
-	channels, err := schema.New(h.bot.DB).GetAllChannels(r.Context())
+	channels, err := h.queries.GetAllChannels(r.Context())
 	if err != nil {
 		return nil, err
 	}
@@ -163,7 +172,7 @@ func (h *httpHandlers) listChannels(r *http.Request) (any, error) {
 
 func (h *httpHandlers) getChannel(r *http.Request) (any, error) {
 	channelName := r.PathValue("channel_name")
-	channel, err := schema.New(h.bot.DB).GetChannelByName(r.Context(), channelName)
+	channel, err := h.queries.GetChannelByName(r.Context(), channelName)
 	if err != nil {
 		return nil, err
 	}
@@ -173,26 +182,34 @@ func (h *httpHandlers) getChannel(r *http.Request) (any, error) {
 
 func (h *httpHandlers) listMessages(r *http.Request) (any, error) {
 	channelName := r.PathValue("channel_name")
-	channel, err := schema.New(h.bot.DB).GetChannelByName(r.Context(), channelName)
-	if err != nil {
-		return nil, err
-	}
-
 	n := cmp.Or(r.URL.Query().Get("n"), "1000")
 	nInt, err := strconv.ParseInt(n, 10, 32)
 	if err != nil {
 		return nil, fmt.Errorf("invalid n: %w", err)
 	}
 
-	return schema.New(h.bot.DB).GetAllMessages(r.Context(), schema.GetAllMessagesParams{
-		ChannelID: channel.ID,
-		N:         int32(nInt),
+	messages, err := h.queries.GetAllMessagesByChannelName(r.Context(), schema.GetAllMessagesByChannelNameParams{
+		ChannelName: channelName,
+		N:           int32(nInt),
 	})
+	if err != nil {
+		return nil, err
+	}
+
+	// Only look the channel up when there is nothing to return, so that an
+	// unknown channel is still reported as not found.
+	if len(messages) == 0 {
+		if _, err := h.queries.GetChannelByName(r.Context(), channelName); err != nil {
+			return nil, err
+		}
+	}
+
+	return messages, nil
 }
 
 func (h *httpHandlers) onboardChannel(r *http.Request) (any, error) {
 	channelName := r.PathValue("channel_name")
-	channel, err := schema.New(h.bot.DB).GetChannelByName(r.Context(), channelName)
+	channel, err := h.queries.GetChannelByName(r.Context(), channelName)
 	if err != nil && !errors.Is(err, pgx.ErrNoRows) {
 		return nil, err
 	}
@@ -219,7 +236,10 @@ func (h *httpHandlers) onboardChannel(r *http.Request) (any, error) {
 	lastNMsgs := cmp.Or(r.URL.Query().Get("n"), "10")
 	lastNMsgsInt, err := strconv.Atoi(lastNMsgs)
 	if err != nil {
-		return nil, fmt.Errorf("invalid last_n_msgs: %w", err)
+		return nil, fmt.Errorf("%w: invalid last_n_msgs: %w", errBadRequest, err)
+	}
+	if lastNMsgsInt <= 0 {
+		return nil, fmt.Errorf("%w: last_n_msgs must be positive, got %d", errBadRequest, lastNMsgsInt)
 	}
 
 	tx, err := h.bot.DB.Begin(r.Context())
@@ -246,7 +266,7 @@ func (h *httpHandlers) onboardChannel(r *http.Request) (any, error) {
 }
 
 func (h *httpHandlers) listServices(r *http.Request) (any, error) {
-	services, err := schema.New(h.bot.DB).GetServices(r.Context())
+	services, err := h.queries.GetServices(r.Context())
 	if err != nil {
 		return nil, err
 	}
@@ -258,7 +278,7 @@ func (h *httpHandlers) listAlerts(r *http.Request) (any, error) {
 	serviceName := r.PathValue("service")
 
 	priorityFilter := r.URL.Query().Get("priority")
-	alerts, err := schema.New(h.bot.DB).GetAlerts(r.Context(), serviceName)
+	alerts, err := h.queries.GetAlerts(r.Context(), serviceName)
 	if err != nil {
 		return nil, err
 	}
@@ -288,8 +308,7 @@ func (h *httpHandlers) listThreadMessages(r *http.Request) (any, error) {
 	serviceName := r.PathValue("service")
 	alertName := r.PathValue("alert")
 
-	qtx := schema.New(h.bot.DB)
-	msgs, err := qtx.GetThreadMessagesByServiceAndAlert(r.Context(), schema.GetThreadMessagesByServiceAndAlertParams{
+	msgs, err := h.queries.GetThreadMessagesByServiceAndAlert(r.Context(), schema.GetThreadMessagesByServiceAndAlertParams{
 		Service: serviceName,
 		Alert:   alertName,
 		BotID:   h.slackIntegration.BotUserID(),
@@ -305,7 +324,7 @@ func (h *httpHandlers) getRunbook(r *http.Request) (any, error) {
 	serviceName := r.PathValue("service")
 	alertName := r.PathValue("alert")
 
-	rbk, err := runbook.Get(r.Context(), schema.New(h.bot.DB), h.llmClient, serviceName, alertName, h.slackIntegration.BotUserID())
+	rbk, err := runbook.Get(r.Context(), h.queries, h.llmClient, serviceName, alertName, h.slackIntegration.BotUserID())
 	if err != nil {
 		return nil, err
 	}
@@ -319,10 +338,9 @@ func (h *httpHandlers) postRunbook(r *http.Request) (any, error) {
 
 	channelID := r.URL.Query().Get("channel_id")
 
-	qtx := schema.New(h.bot.DB)
 	runbookMessage, err := runbook.Get(
 		r.Context(),
-		qtx,
+		h.queries,
 		h.llmClient,
 		serviceName,
 		alertName,
@@ -345,7 +363,7 @@ func (h *httpHandlers) postRunbook(r *http.Request) (any, error) {
 }
 
 func (h *httpHandlers) docsStatus(r *http.Request) (any, error) {
-	status, err := schema.New(h.bot.DB).GetDocumentationStatus(r.Context())
+	status, err := h.queries.GetDocumentationStatus(r.Context())
 	if err != nil {
 		return nil, err
 	}
@@ -463,7 +481,7 @@ func (h *httpHandlers) searchMessages(r *http.Request) (any, error) {
 
 	botID := h.slackIntegration.BotUserID()
 
-	return schema.New(h.bot.DB).SearchMessagesHybrid(r.Context(), schema.SearchMessagesHybridParams{
+	return h.queries.SearchMessagesHybrid(r.Context(), schema.SearchMessagesHybridParams{
 		QueryText:      query,
 		QueryEmbedding: &vec,
 		ChannelNames:   channelNames,
@@ -486,7 +504,7 @@ func (h *httpHandlers) getThreadMessages(r *http.Request) (any, error) {
 		botID = h.slackIntegration.BotUserID()
 	}
 
-	return schema.New(h.bot.DB).GetThreadMessagesWithParent(r.Context(), schema.GetThreadMessagesWithParentParams{
+	return h.queries.GetThreadMessagesWithParent(r.Context(), schema.GetThreadMessagesWithParentParams{
 		ChannelID: channelID,
 		ParentTs:  ts,
 		LimitVal:  1000,